@@ -3,9 +3,16 @@ Configuration settings for WhatsApp Reminder Manager
 Edit these settings to customize behavior
 """
 
+import copy
+import logging
 import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # APPLICATION SETTINGS
 # =============================================================================
@@ -23,6 +30,19 @@ BASE_DIR = Path(__file__).parent
 # Local SQLite database path
 DB_PATH = BASE_DIR / "whatsapp_reminders.db"
 
+# Message log rows are buffered and written in one batch (seconds)
+MESSAGE_LOG_FLUSH_INTERVAL = 2
+
+# Read-only SQLite connections shared by the GUI and scheduler threads
+# (writes always go through one dedicated connection)
+DB_POOL_SIZE = 5
+
+# Seconds a connection waits on a locked database before raising (busy_timeout)
+DB_BUSY_TIMEOUT = 5
+
+# Seconds a thread waits for a free pooled connection before raising
+DB_POOL_TIMEOUT = 30
+
 # =============================================================================
 # BROWSER SETTINGS (Optimized for Gaming PC)
 # =============================================================================
@@ -35,6 +55,28 @@ HEADLESS_BROWSER = True
 # Browser choice: 'chrome' or 'firefox' or 'edge'
 BROWSER = 'chrome'
 
+# Browser profile directory (keeps the WhatsApp Web session between runs)
+BROWSER_DATA_DIR = BASE_DIR / "browser_data"
+BROWSER_DATA_DIR.mkdir(exist_ok=True)
+
+# Resolved ChromeDriver path and the Chrome version it was installed for
+# (skips webdriver-manager's network check on every launch)
+DRIVER_CACHE_FILE = BASE_DIR / "driver_cache.json"
+
+# Chrome's remote debugging port; a browser already listening here (from the
+# GUI or another run) is attached to instead of launching a new one
+BROWSER_DEBUG_PORT = 9222
+
+# Browsers the headless service sends through in parallel. Each slot past
+# the first gets its own profile (browser_data_slotN, beside BROWSER_DATA_DIR)
+# and debug port (BROWSER_DEBUG_PORT + N), and must be linked to WhatsApp once
+# by scanning its QR code (run with HEADLESS_BROWSER = False)
+POOL_SIZE = 1
+
+# How often the headless service checks idle pooled browsers and recycles any
+# that stopped responding (seconds; only used when POOL_SIZE > 1)
+POOL_HEALTH_INTERVAL = 60
+
 # Browser arguments for minimal resource usage
 BROWSER_ARGS = [
     '--headless=new',  # New headless mode (fixes crashes)
@@ -51,19 +93,24 @@ BROWSER_ARGS = [
 
 # Wait times (in seconds)
 WHATSAPP_LOAD_TIME = 20  # Time to wait for WhatsApp Web to load
-MESSAGE_SEND_DELAY = 3   # Delay after sending message
+MESSAGE_SEND_DELAY = 3   # Longest wait for the message text to load before sending
 TAB_CLOSE_DELAY = 2      # Delay before closing tab
 
 # Keep browser session alive (faster subsequent sends)
 KEEP_BROWSER_ALIVE = True
 BROWSER_TIMEOUT = 300  # Close browser after 5 minutes of inactivity
 
+# Trust the profile's saved WhatsApp login for this long after the last
+# successful send (seconds), skipping the login check on startup
+SESSION_TTL = 7 * 24 * 3600
+
 # =============================================================================
 # SCHEDULER SETTINGS
 # =============================================================================
 
-# How often to check for due reminders (seconds)
-CHECK_INTERVAL = 30
+# Longest the scheduler sleeps between checks (seconds); it also wakes on
+# each minute boundary and whenever a reminder changes
+CHECK_INTERVAL = 60
 
 # Check for missed reminders on startup
 CHECK_MISSED_ON_STARTUP = True
@@ -102,7 +149,8 @@ ENABLE_FILE_LOGGING = True
 LOG_LEVEL = 'INFO'
 
 # Maximum log file size (MB)
-MAX_LOG_SIZE = 10
+MAX_LOG_SIZE_MB = 10
+MAX_LOG_SIZE_BYTES = MAX_LOG_SIZE_MB * 1024 * 1024
 
 # Number of backup log files to keep
 LOG_BACKUP_COUNT = 3
@@ -134,17 +182,35 @@ MESSAGE_SUFFIX = ""  # Add suffix to all messages
 
 # Retry settings
 MAX_SEND_RETRIES = 3
-RETRY_DELAY = 10  # seconds between retries
+RETRY_DELAY = 10  # seconds before the first retry; doubles after each timeout
+MAX_RETRY_DELAY = 120  # longest wait between retries (seconds)
+RETRY_JITTER = 3  # up to this many random seconds added to each wait
+
+# Send rate limit (token bucket): messages per second, and how many may go
+# out back-to-back after an idle spell
+SEND_RATE_PER_SECOND = 1
+SEND_BURST = 3
 
 # =============================================================================
 # VALIDATION
 # =============================================================================
 
+# + and country code, then digits/spaces - at least 10 characters in total
+_PHONE_RE = re.compile(r'\+\d[\d ]{8,}')
+
+@lru_cache(maxsize=1024)
 def validate_phone_number(phone):
     """
     Validate phone number format
     Must start with + and country code
+    
+    Results are cached, so phone must be a (hashable) str
     """
+    # Single regex pass for the common (valid) case
+    if _PHONE_RE.fullmatch(phone):
+        return True, "Valid"
+    
+    # Invalid - work out which rule failed for the error message
     if not phone.startswith('+'):
         return False, "Phone must start with + and country code"
     
@@ -152,44 +218,69 @@ def validate_phone_number(phone):
         return False, "Phone number too short"
     
     # Remove + and check if rest is numeric
-    if not phone[1:].replace(' ', '').isdigit():
-        return False, "Phone must contain only numbers after +"
-    
-    return True, "Valid"
+    return False, "Phone must contain only numbers after +"
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
-def get_browser_options():
-    """Get browser options based on settings"""
-    from selenium import webdriver
+# Always added to the browser options
+_STABILITY_ARGS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--window-size=1920,1080',
+    '--log-level=3',
+)
+
+# Also always added: skip background services WhatsApp Web doesn't need
+_LEAN_ARGS = (
+    '--disable-background-networking',
+    '--disable-sync',
+    '--disable-default-apps',
+    '--disable-renderer-backgrounding',
+    '--disable-features=TranslateUI,site-per-process',  # One site, no need for isolation
+    '--mute-audio',
+    '--no-first-run',
+)
+
+# Browser Options class, imported on first use (selenium is slow to import)
+_OPTIONS_CLS = None
+
+def _get_options_class():
+    """Import and cache the Options class for the configured browser"""
+    global _OPTIONS_CLS
     
-    if BROWSER == 'chrome':
-        from selenium.webdriver.chrome.options import Options
-        options = Options()
-    elif BROWSER == 'firefox':
-        from selenium.webdriver.firefox.options import Options
-        options = Options()
-    elif BROWSER == 'edge':
-        from selenium.webdriver.edge.options import Options
-        options = Options()
-    else:
-        raise ValueError(f"Unsupported browser: {BROWSER}")
+    if _OPTIONS_CLS is None:
+        if BROWSER == 'chrome':
+            from selenium.webdriver.chrome.options import Options
+        elif BROWSER == 'firefox':
+            from selenium.webdriver.firefox.options import Options
+        elif BROWSER == 'edge':
+            from selenium.webdriver.edge.options import Options
+        else:
+            raise ValueError(f"Unsupported browser: {BROWSER}")
+        _OPTIONS_CLS = Options
     
-    # Always add these stability arguments
-    stability_args = [
-        '--no-sandbox',
-        '--disable-dev-shm-usage',
-        '--disable-gpu',
-        '--disable-extensions',
-        '--window-size=1920,1080',
-        '--log-level=3',
-        '--remote-debugging-port=9222',
-    ]
+    return _OPTIONS_CLS
+
+def browser_slot_paths(slot=0):
+    """Profile directory and debugging port for a browser pool slot"""
+    if slot == 0:
+        return BROWSER_DATA_DIR, BROWSER_DEBUG_PORT
+    # A sibling, not a subdirectory - slot 0's Chrome profile must not contain the others
+    return BROWSER_DATA_DIR.parent / f"{BROWSER_DATA_DIR.name}_slot{slot}", BROWSER_DEBUG_PORT + slot
+
+@lru_cache(maxsize=None)
+def _build_browser_options(slot=0):
+    """Build the browser options once per process and pool slot"""
+    data_dir, debug_port = browser_slot_paths(slot)
+    options = _get_options_class()()
     
-    for arg in stability_args:
+    for arg in _STABILITY_ARGS + _LEAN_ARGS:
         options.add_argument(arg)
+    options.add_argument(f'--remote-debugging-port={debug_port}')
     
     # Only add headless-specific arguments if headless mode is enabled
     if HEADLESS_BROWSER:
@@ -198,12 +289,38 @@ def get_browser_options():
         options.add_argument('--blink-settings=imagesEnabled=false')
     
     # Add user data directory to keep session
-    user_data_dir = BASE_DIR / "browser_data"
-    user_data_dir.mkdir(exist_ok=True)
-    options.add_argument(f'--user-data-dir={user_data_dir}')
+    options.add_argument(f'--user-data-dir={data_dir}')
     
     return options
 
+def get_browser_options(slot=0):
+    """
+    Get browser options based on settings
+    Returns a copy of the cached options, Selenium may mutate what it is given
+    """
+    return copy.deepcopy(_build_browser_options(slot))
+
+def setup_logging():
+    """Configure the root logger from the logging settings"""
+    from logging.handlers import RotatingFileHandler
+    
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    
+    if ENABLE_FILE_LOGGING and not any(
+        isinstance(h, RotatingFileHandler) for h in root.handlers
+    ):
+        handler = RotatingFileHandler(
+            LOG_FILE,
+            maxBytes=MAX_LOG_SIZE_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+        ))
+        root.addHandler(handler)
+
 def set_process_priority():
     """Set process priority for minimal resource usage"""
     try:
@@ -222,21 +339,76 @@ def set_process_priority():
         
         if PROCESS_PRIORITY in priority_map:
             p.nice(priority_map[PROCESS_PRIORITY])
-            print(f"Process priority set to: {PROCESS_PRIORITY}")
+            logger.info("Process priority set to: %s", PROCESS_PRIORITY)
     except ImportError:
-        print("psutil not installed - skipping process priority setting")
+        logger.warning("psutil not installed - skipping process priority setting")
     except Exception as e:
-        print(f"Could not set process priority: {e}")
+        logger.warning("Could not set process priority: %s", e)
 
 # =============================================================================
 # CONSTANTS
 # =============================================================================
 
-FREQUENCIES = ["Once", "Daily", "Weekdays", "Weekly", "Monthly", "Yearly"]
+FREQUENCIES = ("Once", "Daily", "Weekdays", "Weekly", "Monthly", "Yearly")
+
+MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
 
 STATUS_ACTIVE = "Active"
 STATUS_INACTIVE = "Inactive"
 
 MESSAGE_STATUS_SENT = "sent"
 MESSAGE_STATUS_FAILED = "failed"
-MESSAGE_STATUS_PENDING = "pending"
\ No newline at end of file
+MESSAGE_STATUS_PENDING = "pending"
+
+# =============================================================================
+# SETTINGS SNAPSHOT
+# =============================================================================
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Read-only snapshot of the settings above
+    Module-level names stay available for backwards compatibility
+    """
+    DB_PATH: Path = DB_PATH
+    MESSAGE_LOG_FLUSH_INTERVAL: float = MESSAGE_LOG_FLUSH_INTERVAL
+    DB_POOL_SIZE: int = DB_POOL_SIZE
+    DB_BUSY_TIMEOUT: float = DB_BUSY_TIMEOUT
+    DB_POOL_TIMEOUT: float = DB_POOL_TIMEOUT
+    HEADLESS_BROWSER: bool = HEADLESS_BROWSER
+    BROWSER: str = BROWSER
+    BROWSER_DATA_DIR: Path = BROWSER_DATA_DIR
+    DRIVER_CACHE_FILE: Path = DRIVER_CACHE_FILE
+    BROWSER_DEBUG_PORT: int = BROWSER_DEBUG_PORT
+    POOL_SIZE: int = POOL_SIZE
+    POOL_HEALTH_INTERVAL: int = POOL_HEALTH_INTERVAL
+    WHATSAPP_LOAD_TIME: int = WHATSAPP_LOAD_TIME
+    MESSAGE_SEND_DELAY: int = MESSAGE_SEND_DELAY
+    TAB_CLOSE_DELAY: int = TAB_CLOSE_DELAY
+    KEEP_BROWSER_ALIVE: bool = KEEP_BROWSER_ALIVE
+    BROWSER_TIMEOUT: int = BROWSER_TIMEOUT
+    SESSION_TTL: int = SESSION_TTL
+    CHECK_INTERVAL: int = CHECK_INTERVAL
+    CHECK_MISSED_ON_STARTUP: bool = CHECK_MISSED_ON_STARTUP
+    MISSED_REMINDER_WINDOW: int = MISSED_REMINDER_WINDOW
+    LOG_FILE: Path = LOG_FILE
+    ENABLE_FILE_LOGGING: bool = ENABLE_FILE_LOGGING
+    LOG_LEVEL: str = LOG_LEVEL
+    MAX_LOG_SIZE_MB: int = MAX_LOG_SIZE_MB
+    MAX_LOG_SIZE_BYTES: int = MAX_LOG_SIZE_BYTES
+    LOG_BACKUP_COUNT: int = LOG_BACKUP_COUNT
+    PROCESS_PRIORITY: str = PROCESS_PRIORITY
+    WHATSAPP_WEB_URL: str = WHATSAPP_WEB_URL
+    MESSAGE_PREFIX: str = MESSAGE_PREFIX
+    MESSAGE_SUFFIX: str = MESSAGE_SUFFIX
+    MAX_SEND_RETRIES: int = MAX_SEND_RETRIES
+    RETRY_DELAY: int = RETRY_DELAY
+    MAX_RETRY_DELAY: int = MAX_RETRY_DELAY
+    RETRY_JITTER: float = RETRY_JITTER
+    SEND_RATE_PER_SECOND: float = SEND_RATE_PER_SECOND
+    SEND_BURST: int = SEND_BURST
+
+SETTINGS = Settings()
@@ -3,105 +3,455 @@ Database Manager - SQLite operations
 Handles all database interactions
 """
 
+import atexit
+import calendar
+import logging
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import config
 
-class DatabaseManager:
-    """Manages SQLite database operations"""
+logger = logging.getLogger(__name__)
+
+# Applied to the writer connection - most PRAGMAs are per-connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # Readers don't block the writer
+    "PRAGMA synchronous=NORMAL",  # No fsync per commit (safe with WAL)
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # 20 MB page cache
+    "PRAGMA mmap_size=134217728",  # 128 MB memory-mapped I/O
+    "PRAGMA foreign_keys=ON",  # Honour ON DELETE CASCADE / SET NULL
+)
+
+# Read-only connections skip the journal/sync settings, which only matter to writers
+READER_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=134217728",
+)
+
+# Columns added to existing tables after the first release
+_MIGRATION_COLUMNS = (
+    ("reminders", "schedule_day", "INTEGER"),
+    ("reminders", "schedule_month", "INTEGER"),
+    ("reminders", "next_fire_ts", "INTEGER"),
+)
+
+# Rows per query when streaming the message log with iter_message_log()
+MESSAGE_LOG_CHUNK_SIZE = 1000
+
+# =============================================================================
+# SQL STATEMENTS
+# Kept as constants so the same string object is reused on every call and
+# hits sqlite3's per-connection statement cache
+# =============================================================================
+
+# INSERT ... RETURNING (SQLite 3.35+) hands back the new id in the same step
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+_RETURNING_ID = " RETURNING id" if HAS_RETURNING else ""
+
+_SQL_ADD_CONTACT = "INSERT INTO contacts (name, phone, notes) VALUES (?, ?, ?)" + _RETURNING_ID
+_SQL_ADD_CONTACTS_BULK = "INSERT OR IGNORE INTO contacts (name, phone, notes) VALUES (?, ?, ?)"
+_SQL_GET_ALL_CONTACTS = "SELECT id, name, phone, notes FROM contacts ORDER BY name"
+_SQL_GET_CONTACT = "SELECT id, name, phone, notes FROM contacts WHERE id=?"
+_SQL_UPDATE_CONTACT = "UPDATE contacts SET name=?, phone=?, notes=? WHERE id=?"
+_SQL_DELETE_CONTACT = "DELETE FROM contacts WHERE id=?"
+_SQL_ADD_REMINDER = """
+    INSERT INTO reminders
+    (contact_id, message, schedule_time, frequency, schedule_day, schedule_month)
+    VALUES (?, ?, ?, ?, ?, ?)
+""" + _RETURNING_ID
+_SQL_GET_ALL_REMINDERS = """
+    SELECT r.id, c.name as contact_name, c.phone, r.message, r.schedule_time,
+           r.frequency, r.schedule_day, r.schedule_month, r.is_active, r.last_sent
+    FROM reminders r
+    JOIN contacts c ON r.contact_id = c.id
+    ORDER BY r.schedule_time
+"""
+# "HH:MM" split into integers once, in SQL, so the scheduler never parses strings
+_SQL_SCHEDULE_HOUR_MINUTE = """
+    CAST(r.schedule_time AS INTEGER) AS schedule_hour,
+    CAST(substr(r.schedule_time, instr(r.schedule_time, ':') + 1) AS INTEGER) AS schedule_minute
+"""
+# Local year*100 + month of last_sent, for "already sent this month/year" checks
+_SQL_LAST_SENT_PERIOD = """
+    CAST(strftime('%Y%m', r.last_sent, 'unixepoch', 'localtime') AS INTEGER) AS last_sent_period
+"""
+# Reminder queries select Reminder's fields in declaration order
+_SQL_SELECT_REMINDER = """
+    SELECT r.id, c.name as contact_name, c.phone, r.message, r.schedule_time,
+           r.frequency, r.schedule_day, r.schedule_month, r.last_sent, r.next_fire_ts,
+""" + _SQL_SCHEDULE_HOUR_MINUTE + ", " + _SQL_LAST_SENT_PERIOD + """
+    FROM reminders r
+    JOIN contacts c ON r.contact_id = c.id
+"""
+_SQL_GET_ACTIVE_REMINDERS = _SQL_SELECT_REMINDER + """
+    WHERE r.is_active = 1
+    ORDER BY r.schedule_time
+"""
+_SQL_GET_DUE_REMINDERS = _SQL_SELECT_REMINDER + """
+    WHERE r.is_active = 1 AND r.next_fire_ts <= ?
+    ORDER BY r.next_fire_ts
+"""
+# Filled in by get_missed_candidates() with per-frequency clauses
+_SQL_GET_MISSED_CANDIDATES = _SQL_SELECT_REMINDER + """
+    WHERE r.is_active = 1 AND {time_clause} AND (
+        r.frequency IN ('Once', 'Daily', 'Weekdays')
+        OR (r.frequency = 'Weekly' AND r.last_sent > ? AND r.last_sent <= ?)
+        OR (r.frequency = 'Monthly' AND (r.schedule_day IN ({month_days}) OR r.schedule_day >= ?))
+        OR (r.frequency = 'Yearly' AND (r.schedule_month * 100 + r.schedule_day IN ({year_days}){year_ends}))
+    )
+    ORDER BY r.schedule_time
+"""
+# Minute of the day a reminder fires at
+_SQL_MINUTE_OF_DAY = "(CAST(r.schedule_time AS INTEGER) * 60 + CAST(substr(r.schedule_time, instr(r.schedule_time, ':') + 1) AS INTEGER))"
+# Active reminders still waiting for a next_fire_ts (new, re-activated or
+# migrated); a "Once" reminder that has been sent never fires again
+_SQL_GET_UNSCHEDULED_REMINDERS = """
+    SELECT r.id, r.frequency, r.schedule_day, r.schedule_month, r.last_sent,
+""" + _SQL_SCHEDULE_HOUR_MINUTE + """
+    FROM reminders r
+    WHERE r.is_active = 1 AND r.next_fire_ts IS NULL
+      AND NOT (r.frequency = 'Once' AND r.last_sent IS NOT NULL)
+"""
+_SQL_SET_NEXT_FIRE = "UPDATE reminders SET next_fire_ts=? WHERE id=?"
+_SQL_REMINDERS_VERSION = "SELECT value FROM meta WHERE key = 'reminders_version'"
+# Same JOIN as _SQL_GET_DUE_REMINDERS - a reminder whose contact is gone is
+# never fetched, so it must not count as due either
+_SQL_NEXT_DUE_TIME = """
+    SELECT MIN(r.next_fire_ts)
+    FROM reminders r
+    JOIN contacts c ON r.contact_id = c.id
+    WHERE r.is_active = 1
+"""
+# Re-activating must not fire a stale next_fire_ts, so the scheduler recomputes it
+_SQL_SET_REMINDER_ACTIVE = "UPDATE reminders SET is_active=?, next_fire_ts=NULL WHERE id=?"
+_SQL_DELETE_REMINDER = "DELETE FROM reminders WHERE id=?"
+# last_sent is stored as epoch seconds so the scheduler never parses dates
+_SQL_UPDATE_LAST_SENT = "UPDATE reminders SET last_sent=CAST(strftime('%s', 'now') AS INTEGER) WHERE id=?"
+_SQL_SET_LAST_SENT = "UPDATE reminders SET last_sent=? WHERE id=?"
+# Older databases stored local "YYYY-MM-DD HH:MM:SS" text
+_SQL_MIGRATE_LAST_SENT = """
+    UPDATE reminders SET last_sent = CAST(strftime('%s', last_sent, 'utc') AS INTEGER)
+    WHERE typeof(last_sent) = 'text'
+"""
+_SQL_LOG_MESSAGE = """
+    INSERT INTO message_log
+    (reminder_id, phone, message, status, error_message)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_GET_MESSAGE_LOG = """
+    SELECT id, reminder_id, phone, message, status, sent_at, error_message
+    FROM message_log
+    ORDER BY sent_at DESC, id DESC
+    LIMIT ?
+"""
+# Next page after the (sent_at, id) of the last row already returned
+_SQL_GET_MESSAGE_LOG_AFTER = """
+    SELECT id, reminder_id, phone, message, status, sent_at, error_message
+    FROM message_log
+    WHERE (sent_at, id) < (?, ?)
+    ORDER BY sent_at DESC, id DESC
+    LIMIT ?
+"""
+_SQL_CLEANUP_LOGS = "DELETE FROM message_log WHERE sent_at < ?"
+_SQL_GET_SETTING = "SELECT value FROM settings WHERE key=?"
+_SQL_GET_ALL_SETTINGS = "SELECT key, value FROM settings"
+_SQL_SET_SETTING = "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)"
+_SQL_COUNT_CONTACTS = "SELECT COUNT(*) FROM contacts"
+_SQL_REMINDER_STATS = """
+    SELECT COUNT(*), COALESCE(SUM(CASE WHEN is_active=1 THEN 1 ELSE 0 END), 0)
+    FROM reminders
+"""
+_SQL_MESSAGE_STATS = """
+    SELECT COUNT(*), COALESCE(SUM(CASE WHEN status='sent' THEN 1 ELSE 0 END), 0)
+    FROM message_log
+"""
+
+@dataclass(frozen=True, slots=True)
+class Reminder:
+    """An active reminder with its contact, as read by the scheduler"""
+    id: int
+    contact_name: str
+    phone: str
+    message: str
+    schedule_time: str
+    frequency: str
+    schedule_day: int | None
+    schedule_month: int | None
+    last_sent: int | None
+    next_fire_ts: int | None
+    schedule_hour: int
+    schedule_minute: int
+    last_sent_period: int | None
+
+def _reminder_factory(cursor, row):
+    """Row factory building Reminder objects straight from result tuples"""
+    return Reminder(*row)
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections shared between threads"""
     
-    def __init__(self, db_path=None):
-        """Initialize database manager"""
-        self.db_path = db_path or config.DB_PATH
-        self.init_database()
-        self.migrate_database()
+    def __init__(self, factory, size, timeout=None):
+        """Connections are created lazily, up to size; acquire() waits up to timeout seconds"""
+        self._factory = factory
+        self._size = max(1, size)
+        self._timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
     
-    def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+    def acquire(self):
+        """
+        Take an idle connection, open a new one, or wait for one to be returned
+        
+        Raises:
+            sqlite3.OperationalError: If none is returned within the timeout
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if len(self._all) < self._size:
+                conn = self._factory()
+                self._all.append(conn)
+                return conn
+        
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a pooled database connection") from None
     
-    def init_database(self):
-        """Create database tables if they don't exist"""
-        conn = self.get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    def release(self, conn):
+        """Return a connection to the pool"""
+        with self._lock:
+            owned = conn in self._all
         
-        # Contacts table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS contacts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                phone TEXT NOT NULL UNIQUE,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        if not owned:
+            # Pool was closed while the connection was checked out
+            conn.close()
+            return
         
-        # Reminders table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                contact_id INTEGER,
-                message TEXT NOT NULL,
-                schedule_time TEXT NOT NULL,
-                frequency TEXT NOT NULL,
-                schedule_day INTEGER,
-                schedule_month INTEGER,
-                is_active BOOLEAN DEFAULT 1,
-                last_sent TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (contact_id) REFERENCES contacts(id) ON DELETE CASCADE
-            )
-        """)
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+    
+    def close_all(self):
+        """Close every connection; the pool refills on the next acquire()"""
+        with self._lock:
+            connections, self._all = self._all, []
+            self._idle = queue.LifoQueue()
         
-        # Message log table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS message_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                reminder_id INTEGER,
-                phone TEXT,
-                message TEXT,
-                status TEXT,
-                sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                error_message TEXT,
-                FOREIGN KEY (reminder_id) REFERENCES reminders(id) ON DELETE SET NULL
-            )
-        """)
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+class DatabaseManager:
+    """Manages SQLite database operations"""
+    
+    def __init__(self, db_path=None, settings=None):
+        """Initialize database manager"""
+        self.settings = settings or config.SETTINGS
+        self.db_path = db_path or self.settings.DB_PATH
         
-        # Settings table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
+        # Shared by the GUI and scheduler threads: one writer (serialised),
+        # several read-only readers that run in parallel under WAL
+        self._writer_pool = ConnectionPool(self._connect, 1, self.settings.DB_POOL_TIMEOUT)
+        self._reader_pool = ConnectionPool(
+            self._connect_readonly, self.settings.DB_POOL_SIZE, self.settings.DB_POOL_TIMEOUT
+        )
         
-        conn.commit()
-        conn.close()
-        print(f"Database initialized: {self.db_path}")
-    
-    def migrate_database(self):
-        """Add new columns if they don't exist"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        # Pending message_log rows, flushed in batches
+        self._log_buffer = []
+        self._log_lock = threading.Lock()
+        self._log_timer = None
         
+        atexit.register(self.close)
+        
+        self._ensure_schema()
+    
+    def _connect(self):
+        """Open a new connection with the standard PRAGMAs applied"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.settings.DB_BUSY_TIMEOUT,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _connect_readonly(self):
+        """Open a read-only connection (the writer has already set up WAL)"""
+        conn = sqlite3.connect(
+            Path(self.db_path).resolve().as_uri() + "?mode=ro",
+            uri=True,
+            timeout=self.settings.DB_BUSY_TIMEOUT,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in READER_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def read(self):
+        """Borrow a read-only connection for the duration of the block"""
+        conn = self._reader_pool.acquire()
         try:
-            cursor.execute("PRAGMA table_info(reminders)")
-            columns = [col[1] for col in cursor.fetchall()]
+            yield conn
+        finally:
+            self._reader_pool.release(conn)
+    
+    @contextmanager
+    def write(self):
+        """Hold the single writer connection for the duration of the block"""
+        conn = self._writer_pool.acquire()
+        try:
+            yield conn
+        finally:
+            self._writer_pool.release(conn)
+    
+    def _insert(self, conn, sql, params):
+        """Run an INSERT built with _RETURNING_ID and return the new row id"""
+        cursor = conn.execute(sql, params)
+        if HAS_RETURNING:
+            return cursor.fetchone()[0]
+        return cursor.lastrowid
+    
+    def close(self):
+        """Flush pending writes and close all database connections"""
+        self.flush_logs()
+        self._writer_pool.close_all()
+        self._reader_pool.close_all()
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements in a single transaction"""
+        with self.write() as conn:
+            # Take the write lock up front rather than on the first write
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+    
+    def _ensure_schema(self):
+        """
+        Create tables, apply column migrations and build indexes
+        Everything runs in one transaction, so a cold start costs one commit
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
             
-            if 'schedule_day' not in columns:
-                cursor.execute("ALTER TABLE reminders ADD COLUMN schedule_day INTEGER")
+            # Contacts table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS contacts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    phone TEXT NOT NULL UNIQUE,
+                    notes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
             
-            if 'schedule_month' not in columns:
-                cursor.execute("ALTER TABLE reminders ADD COLUMN schedule_month INTEGER")
+            # Reminders table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS reminders (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    contact_id INTEGER,
+                    message TEXT NOT NULL,
+                    schedule_time TEXT NOT NULL,
+                    frequency TEXT NOT NULL,
+                    schedule_day INTEGER,
+                    schedule_month INTEGER,
+                    is_active BOOLEAN DEFAULT 1,
+                    last_sent TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (contact_id) REFERENCES contacts(id) ON DELETE CASCADE
+                )
+            """)
             
-            conn.commit()
-        except Exception as e:
-            print(f"Migration error: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
+            # Message log table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS message_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    reminder_id INTEGER,
+                    phone TEXT,
+                    message TEXT,
+                    status TEXT,
+                    sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    error_message TEXT,
+                    FOREIGN KEY (reminder_id) REFERENCES reminders(id) ON DELETE SET NULL
+                )
+            """)
+            
+            # Settings table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            
+            # Change counters; reminders_version is bumped by triggers on every
+            # write to reminders so readers can tell whether anything changed
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('reminders_version', 0)")
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_reminders_version_{event.lower()}
+                    AFTER {event} ON reminders
+                    BEGIN
+                        UPDATE meta SET value = value + 1 WHERE key = 'reminders_version';
+                    END
+                """)
+            
+            # Columns added after the first release
+            for table, column, column_type in _MIGRATION_COLUMNS:
+                try:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                except sqlite3.OperationalError as e:
+                    if 'duplicate column' not in str(e):
+                        raise
+            cursor.execute(_SQL_MIGRATE_LAST_SENT)
+            
+            # Indexes for the scheduler / log queries
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reminders_active_time
+                ON reminders(is_active, schedule_time)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reminders_next_fire
+                ON reminders(next_fire_ts) WHERE is_active = 1
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_contact ON reminders(contact_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_msglog_sent_at ON message_log(sent_at DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_msglog_reminder ON message_log(reminder_id)")
+            
+            # Refresh planner statistics
+            cursor.execute("ANALYZE")
+            
+        logger.debug("Database initialized: %s", self.db_path)
     
     # =========================================================================
     # CONTACT OPERATIONS
@@ -109,67 +459,63 @@ class DatabaseManager:
     
     def add_contact(self, name, phone, notes=""):
         """Add new contact"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute(
-                "INSERT INTO contacts (name, phone, notes) VALUES (?, ?, ?)",
-                (name, phone, notes)
-            )
-            conn.commit()
-            contact_id = cursor.lastrowid
-            print(f"Contact added: {name} ({phone})")
+            with self.write() as conn:
+                contact_id = self._insert(conn, _SQL_ADD_CONTACT, (name, phone, notes))
+            logger.debug("Contact added: %s (%s)", name, phone)
             return contact_id
         except sqlite3.IntegrityError:
-            print(f"Contact already exists: {phone}")
+            logger.debug("Contact already exists: %s", phone)
             return None
-        finally:
-            conn.close()
+    
+    def add_contacts_bulk(self, rows):
+        """
+        Add many contacts in one transaction (e.g. a CSV import)
+        
+        Args:
+            rows: Iterable of (name, phone, notes) tuples
+        
+        Returns:
+            Number of contacts inserted - existing phone numbers are skipped
+        """
+        with self.transaction() as conn:
+            cursor = conn.executemany(_SQL_ADD_CONTACTS_BULK, rows)
+        
+        added = cursor.rowcount
+        logger.debug("Bulk contact import: %s added", added)
+        return added
     
     def get_all_contacts(self):
         """Get all contacts"""
-        conn = self.get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name, phone, notes FROM contacts ORDER BY name")
-        contacts = cursor.fetchall()
-        conn.close()
-        return contacts
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_ALL_CONTACTS)
+            return cursor.fetchall()
     
     def get_contact(self, contact_id):
         """Get single contact by ID"""
-        conn = self.get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name, phone, notes FROM contacts WHERE id=?", (contact_id,))
-        contact = cursor.fetchone()
-        conn.close()
-        return contact
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_CONTACT, (contact_id,))
+            return cursor.fetchone()
     
     def update_contact(self, contact_id, name, phone, notes):
         """Update contact"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE contacts SET name=?, phone=?, notes=? WHERE id=?",
-            (name, phone, notes, contact_id)
-        )
-        conn.commit()
-        conn.close()
-        print(f"Contact updated: {name}")
-        return True
+        with self.write() as conn:
+            conn.execute(
+                _SQL_UPDATE_CONTACT,
+                (name, phone, notes, contact_id)
+            )
+            logger.debug("Contact updated: %s", name)
+            return True
     
     def delete_contact(self, contact_id):
         """Delete contact and associated reminders"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM reminders WHERE contact_id=?", (contact_id,))
-        cursor.execute("DELETE FROM contacts WHERE id=?", (contact_id,))
-        conn.commit()
-        conn.close()
-        print(f"Contact deleted: ID {contact_id}")
-        return True
+        with self.write() as conn:
+            # Reminders go via ON DELETE CASCADE (foreign_keys=ON)
+            conn.execute(_SQL_DELETE_CONTACT, (contact_id,))
+            logger.debug("Contact deleted: ID %s", contact_id)
+            return True
     
     # =========================================================================
     # REMINDER OPERATIONS
@@ -177,64 +523,38 @@ class DatabaseManager:
     
     def add_reminder(self, contact_id, message, schedule_time, frequency, schedule_day=None, schedule_month=None):
         """Add new reminder"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """INSERT INTO reminders 
-            (contact_id, message, schedule_time, frequency, schedule_day, schedule_month) 
-            VALUES (?, ?, ?, ?, ?, ?)""",
-            (contact_id, message, schedule_time, frequency, schedule_day, schedule_month)
-        )
-        conn.commit()
-        reminder_id = cursor.lastrowid
-        conn.close()
-        print(f"Reminder added: ID {reminder_id}")
-        return reminder_id
+        with self.write() as conn:
+            reminder_id = self._insert(
+                conn,
+                _SQL_ADD_REMINDER,
+                (contact_id, message, schedule_time, frequency, schedule_day, schedule_month)
+            )
+            logger.debug("Reminder added: ID %s", reminder_id)
+            return reminder_id
     
     def get_all_reminders(self):
         """Get all reminders with contact info"""
-        conn = self.get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT r.id, c.name as contact_name, c.phone, r.message, r.schedule_time, 
-                   r.frequency, r.schedule_day, r.schedule_month, r.is_active, r.last_sent
-            FROM reminders r
-            JOIN contacts c ON r.contact_id = c.id
-            ORDER BY r.schedule_time
-        """)
-        reminders = cursor.fetchall()
-        conn.close()
-        return reminders
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_ALL_REMINDERS)
+            return cursor.fetchall()
     
     def get_active_reminders(self):
-        """Get only active reminders"""
-        conn = self.get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT r.id, c.name as contact_name, c.phone, r.message, r.schedule_time, 
-                   r.frequency, r.schedule_day, r.schedule_month, r.last_sent
-            FROM reminders r
-            JOIN contacts c ON r.contact_id = c.id
-            WHERE r.is_active = 1
-            ORDER BY r.schedule_time
-        """)
-        reminders = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in reminders]
+        """Get only active reminders as Reminder objects"""
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _reminder_factory
+            cursor.execute(_SQL_GET_ACTIVE_REMINDERS)
+            return cursor.fetchall()
     
     def update_reminder_status(self, reminder_id, is_active):
         """Enable/disable reminder"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE reminders SET is_active=? WHERE id=?",
-            (is_active, reminder_id)
-        )
-        conn.commit()
-        conn.close()
-        return True
+        with self.write() as conn:
+            conn.execute(
+                _SQL_SET_REMINDER_ACTIVE,
+                (is_active, reminder_id)
+            )
+            return True
     
     def toggle_reminder(self, reminder_id, is_active):
         """Toggle reminder (alias for update_reminder_status)"""
@@ -242,71 +562,184 @@ class DatabaseManager:
     
     def delete_reminder(self, reminder_id):
         """Delete reminder"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM reminders WHERE id=?", (reminder_id,))
-        conn.commit()
-        conn.close()
-        print(f"Reminder deleted: ID {reminder_id}")
-        return True
+        with self.write() as conn:
+            conn.execute(_SQL_DELETE_REMINDER, (reminder_id,))
+            logger.debug("Reminder deleted: ID %s", reminder_id)
+            return True
     
     def update_last_sent(self, reminder_id):
         """Update last sent timestamp"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute(
-            "UPDATE reminders SET last_sent=? WHERE id=?",
-            (now, reminder_id)
+        with self.write() as conn:
+            conn.execute(_SQL_UPDATE_LAST_SENT, (reminder_id,))
+    
+    def update_last_sent_bulk(self, rows):
+        """
+        Store last sent timestamps in one transaction
+        
+        Args:
+            rows: Iterable of (epoch_seconds, reminder_id) tuples
+        """
+        with self.transaction() as conn:
+            conn.executemany(_SQL_SET_LAST_SENT, rows)
+    
+    def get_missed_candidates(self, window_start, now):
+        """
+        Get active reminders that could have a slot between window_start and now
+        A conservative pre-filter for check_missed_reminders, which still does
+        the exact per-slot checks
+        """
+        days = [
+            window_start.date() + timedelta(days=i)
+            for i in range((now.date() - window_start.date()).days + 1)
+        ]
+        # Days that end their month also catch larger schedule_days (31st -> 30th)
+        month_ends = [d for d in days if d.day == calendar.monthrange(d.year, d.month)[1]]
+        params = []
+        
+        if now - window_start < timedelta(days=1):
+            # Only times of day inside the window can match (it may wrap midnight)
+            start_minute = window_start.hour * 60 + window_start.minute
+            end_minute = now.hour * 60 + now.minute
+            joiner = "AND" if start_minute <= end_minute else "OR"
+            time_clause = f"({_SQL_MINUTE_OF_DAY} >= ? {joiner} {_SQL_MINUTE_OF_DAY} <= ?)"
+            params += [start_minute, end_minute]
+        else:
+            time_clause = "1"
+        
+        # Weekly: sent inside the window and at least a week ago
+        params += [window_start.timestamp(), now.timestamp() - 7 * 86400]
+        
+        # Monthly: schedule_day on a day in the window, or clamped to a month end
+        params += sorted({d.day for d in days})
+        params.append(min((d.day for d in month_ends), default=32))
+        
+        # Yearly: (month, day) in the window, or clamped to a month end
+        params += [d.month * 100 + d.day for d in days]
+        for d in month_ends:
+            params += [d.month, d.day]
+        
+        sql = _SQL_GET_MISSED_CANDIDATES.format(
+            time_clause=time_clause,
+            month_days=", ".join("?" * len({d.day for d in days})),
+            year_days=", ".join("?" * len(days)),
+            year_ends=" OR (r.schedule_month = ? AND r.schedule_day >= ?)" * len(month_ends)
         )
-        conn.commit()
-        conn.close()
+        
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _reminder_factory
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    
+    def get_due_reminders(self, now_ts):
+        """Get active reminders whose next_fire_ts is at or before now_ts, as Reminder objects"""
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _reminder_factory
+            cursor.execute(_SQL_GET_DUE_REMINDERS, (now_ts,))
+            return cursor.fetchall()
+    
+    def get_unscheduled_reminders(self):
+        """Get active reminders that have no next_fire_ts yet"""
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_UNSCHEDULED_REMINDERS)
+            return cursor.fetchall()
+    
+    def set_next_fire_bulk(self, rows):
+        """
+        Store next fire times in one transaction
+        
+        Args:
+            rows: Iterable of (next_fire_ts, reminder_id) tuples
+        """
+        with self.transaction() as conn:
+            conn.executemany(_SQL_SET_NEXT_FIRE, rows)
+    
+    def get_reminders_version(self):
+        """Get the counter bumped on every write to the reminders table"""
+        with self.read() as conn:
+            return conn.execute(_SQL_REMINDERS_VERSION).fetchone()[0]
+    
+    def get_next_due_time(self):
+        """Get the earliest next_fire_ts among active reminders, or None"""
+        with self.read() as conn:
+            return conn.execute(_SQL_NEXT_DUE_TIME).fetchone()[0]
     
     # =========================================================================
     # MESSAGE LOG OPERATIONS
     # =========================================================================
     
     def log_message(self, reminder_id, phone, message, status, error_message=None):
-        """Log sent message"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """INSERT INTO message_log 
-            (reminder_id, phone, message, status, error_message) 
-            VALUES (?, ?, ?, ?, ?)""",
-            (reminder_id, phone, message, status, error_message)
-        )
-        conn.commit()
-        conn.close()
+        """Log sent message (buffered, see flush_logs)"""
+        with self._log_lock:
+            self._log_buffer.append((reminder_id, phone, message, status, error_message))
+            
+            # Schedule a flush for the first row of a new batch
+            if self._log_timer is None:
+                self._log_timer = threading.Timer(
+                    self.settings.MESSAGE_LOG_FLUSH_INTERVAL,
+                    self.flush_logs
+                )
+                self._log_timer.daemon = True
+                self._log_timer.start()
+    
+    def flush_logs(self):
+        """Write buffered message log rows in one transaction"""
+        with self._log_lock:
+            rows, self._log_buffer = self._log_buffer, []
+            if self._log_timer is not None:
+                self._log_timer.cancel()
+                self._log_timer = None
+        
+        if not rows:
+            return 0
+        
+        with self.transaction() as conn:
+            conn.executemany(
+                _SQL_LOG_MESSAGE,
+                rows
+            )
+        return len(rows)
     
     def get_message_log(self, limit=100):
         """Get recent message log"""
-        conn = self.get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, reminder_id, phone, message, status, sent_at, error_message
-            FROM message_log
-            ORDER BY sent_at DESC
-            LIMIT ?
-        """, (limit,))
-        logs = cursor.fetchall()
-        conn.close()
-        return logs
+        self.flush_logs()
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_MESSAGE_LOG, (limit,))
+            return cursor.fetchall()
+    
+    def iter_message_log(self, limit=100, chunk_size=MESSAGE_LOG_CHUNK_SIZE):
+        """
+        Yield recent message log rows, newest first, for large exports
+        Each chunk is its own query, so no pooled connection is held between
+        yields and at most chunk_size rows are in memory
+        """
+        self.flush_logs()
+        sql, params = _SQL_GET_MESSAGE_LOG, ()
+        while limit > 0:
+            with self.read() as conn:
+                rows = conn.execute(sql, params + (min(chunk_size, limit),)).fetchall()
+            if not rows:
+                break
+            yield from rows
+            limit -= len(rows)
+            last = rows[-1]
+            sql, params = _SQL_GET_MESSAGE_LOG_AFTER, (last['sent_at'], last['id'])
     
     def cleanup_old_logs(self, days=30):
         """Delete logs older than specified days"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            DELETE FROM message_log 
-            WHERE sent_at < datetime('now', '-' || ? || ' days')
-        """, (days,))
-        deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
-        print(f"Cleaned up {deleted} old log entries")
-        return deleted
+        self.flush_logs()
+        
+        # sent_at defaults to CURRENT_TIMESTAMP, which is UTC
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        
+        with self.write() as conn:
+            cursor = conn.execute(_SQL_CLEANUP_LOGS, (cutoff,))
+            deleted = cursor.rowcount
+            logger.debug("Cleaned up %s old log entries", deleted)
+            return deleted
     
     # =========================================================================
     # SETTINGS OPERATIONS
@@ -314,23 +747,26 @@ class DatabaseManager:
     
     def get_setting(self, key, default=None):
         """Get setting value"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT value FROM settings WHERE key=?", (key,))
-        result = cursor.fetchone()
-        conn.close()
-        return result[0] if result else default
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_SETTING, (key,))
+            result = cursor.fetchone()
+            return result[0] if result else default
+    
+    def get_all_settings(self):
+        """Get all settings as (key, value) rows"""
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_ALL_SETTINGS)
+            return cursor.fetchall()
     
     def set_setting(self, key, value):
         """Set setting value"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-            (key, value)
-        )
-        conn.commit()
-        conn.close()
+        with self.write() as conn:
+            conn.execute(
+                _SQL_SET_SETTING,
+                (key, value)
+            )
     
     # =========================================================================
     # UTILITY OPERATIONS
@@ -338,42 +774,44 @@ class DatabaseManager:
     
     def get_stats(self):
         """Get database statistics"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM contacts")
-        total_contacts = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM reminders")
-        total_reminders = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM reminders WHERE is_active=1")
-        active_reminders = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM message_log")
-        total_messages = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM message_log WHERE status='sent'")
-        successful_messages = cursor.fetchone()[0]
-        
-        conn.close()
-        
-        return {
-            'total_contacts': total_contacts,
-            'total_reminders': total_reminders,
-            'active_reminders': active_reminders,
-            'total_messages': total_messages,
-            'successful_messages': successful_messages,
-        }
+        self.flush_logs()
+        with self.read() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_COUNT_CONTACTS)
+            total_contacts = cursor.fetchone()[0]
+            
+            # One scan per table, SUM() is NULL on an empty table
+            cursor.execute(_SQL_REMINDER_STATS)
+            total_reminders, active_reminders = cursor.fetchone()
+            
+            cursor.execute(_SQL_MESSAGE_STATS)
+            total_messages, successful_messages = cursor.fetchone()
+            
+            return {
+                'total_contacts': total_contacts,
+                'total_reminders': total_reminders,
+                'active_reminders': active_reminders,
+                'total_messages': total_messages,
+                'successful_messages': successful_messages,
+            }
     
     def backup_database(self, backup_path=None):
-        """Create database backup"""
-        import shutil
-        
+        """Create database backup using SQLite's online backup API"""
         if backup_path is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_path = Path(self.db_path).parent / f"backup_{timestamp}.db"
         
-        shutil.copy2(self.db_path, backup_path)
-        print(f"Database backed up to: {backup_path}")
+        self.flush_logs()
+        
+        # Page-by-page copy through the pager gives a consistent snapshot,
+        # even while the WAL has uncheckpointed commits
+        dst = sqlite3.connect(backup_path)
+        try:
+            with self.read() as conn:
+                conn.backup(dst, pages=1000, sleep=0.001)
+        finally:
+            dst.close()
+        
+        logger.debug("Database backed up to: %s", backup_path)
         return backup_path
\ No newline at end of file
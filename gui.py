@@ -7,18 +7,29 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
 import time
-import io
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import config
 from database import DatabaseManager
 from whatsapp_service import WhatsAppService
 from scheduler_service import SchedulerService
 
 try:
-    from PIL import Image, ImageTk, ImageDraw
+    from PIL import Image, ImageDraw, ImageFont
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
-    print("Warning: Pillow not installed - QR code display disabled")
+    print("Warning: Pillow not installed - tray icon disabled")
+
+try:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+    print("Warning: selenium not installed - WhatsApp setup disabled")
 
 try:
     import pystray
@@ -28,6 +39,293 @@ except ImportError:
     PYSTRAY_AVAILABLE = False
     print("Warning: pystray not installed - system tray disabled")
 
+@lru_cache(maxsize=1)
+def _build_tray_image():
+    """Render the tray icon once - a 64x64 WhatsApp-green square with "WA" text"""
+    image = Image.new('RGB', (64, 64), color='#25D366')  # WhatsApp green
+    draw = ImageDraw.Draw(image)
+    
+    # Draw white text, with a real font if one is available
+    try:
+        font = ImageFont.truetype("arial.ttf", 36)
+        draw.text((8, 10), "WA", fill='white', font=font)
+    except Exception:
+        draw.text((8, 20), "WA", fill='white')
+    
+    return image
+
+# Every selector the QR canvas has been seen under, as one CSS selector list
+# so Selenium needs a single findElements round trip per poll
+QR_CANVAS_SELECTOR = (
+    'canvas[aria-label="Scan this QR code to link a device!"]'
+    ', canvas[role="img"]'
+    ', div[class*="landing-wrapper"] canvas'
+    ', div[data-ref] canvas'
+    ', canvas[style*="cursor"]'
+)
+
+# Any canvas at all - only tried when QR_CANVAS_SELECTOR matches nothing, so
+# it can't win over the labelled QR canvas by coming first in the document
+QR_CANVAS_FALLBACK_SELECTOR = 'canvas'
+
+# Chat search box - only present once WhatsApp Web is logged in
+LOGGED_IN_SELECTOR = 'div[contenteditable="true"][data-tab="3"]'
+
+class _FirstVisible:
+    """
+    WebDriverWait condition: first displayed element matching the locators,
+    tried in priority order - a later locator is only used when every earlier
+    one has nothing displayed
+    One findElements round trip per locator, however many selectors it lists
+    """
+    
+    def __init__(self, *locators):
+        self.locators = locators
+    
+    def __call__(self, driver):
+        for locator in self.locators:
+            for elem in driver.find_elements(*locator):
+                if elem.is_displayed() and elem.size['width'] > 0:
+                    return elem
+        return False
+
+# Displayed QR codes are zoomed to at least this many pixels - make it LARGE
+QR_TARGET_SIZE = 500
+
+# Setup progress is polled from the worker's queue on the Tk thread
+SETUP_POLL_INTERVAL_MS = 50
+
+class _SetupWorker(threading.Thread):
+    """
+    Runs the WhatsApp Web setup sequence off the Tk thread
+    Progress is posted to out_queue as (state, payload) tuples
+    """
+    
+    LOADING_PAGE = "loading_page"
+    QR_READY = "qr_ready"
+    QR_UNAVAILABLE = "qr_unavailable"
+    WAITING_QR = "waiting_qr"
+    LOGGED_IN = "logged_in"
+    SCAN_PENDING = "scan_pending"
+    BROWSER_FAILED = "browser_failed"
+    ERROR = "error"
+    
+    FINAL_STATES = frozenset((LOGGED_IN, SCAN_PENDING, BROWSER_FAILED, ERROR))
+    
+    def __init__(self, whatsapp, out_queue, log):
+        """Initialize setup worker"""
+        super().__init__(daemon=True)
+        self.whatsapp = whatsapp
+        self.out_queue = out_queue
+        self.log = log
+    
+    def post(self, state, payload=None):
+        """Send a state change to the Tk thread"""
+        self.out_queue.put((state, payload))
+    
+    def run(self):
+        """Browser start -> WhatsApp Web -> QR capture -> wait for login"""
+        try:
+            self.log("Starting WhatsApp Web setup...")
+            
+            # Initialize browser
+            if not self.whatsapp.init_browser():
+                self.post(self.BROWSER_FAILED)
+                return
+            
+            # Open WhatsApp Web
+            driver = self.whatsapp.driver
+            driver.get(config.WHATSAPP_WEB_URL)
+            self.post(self.LOADING_PAGE)
+            
+            # Wait a moment for page to load
+            time.sleep(3)
+            
+            # One wait object for the whole setup page (QR, then login)
+            wait = WebDriverWait(
+                driver, 60,
+                poll_frequency=0.3,
+                ignored_exceptions=(StaleElementReferenceException,)
+            )
+            
+            # Try to capture QR code
+            self.capture_qr(driver, wait)
+            
+            # Check if logged in (wait up to 60 seconds)
+            self.post(self.WAITING_QR)
+            
+            try:
+                # Wait for the search box (indicates logged in)
+                wait.until(_FirstVisible((By.CSS_SELECTOR, LOGGED_IN_SELECTOR)))
+                
+                # Success!
+                self.whatsapp.is_logged_in = True
+                self.post(self.LOGGED_IN)
+                self.log("WhatsApp Web login successful!")
+                
+            except Exception:
+                # Timeout or error
+                self.post(self.SCAN_PENDING)
+                self.log("Waiting for QR code scan...")
+            
+        except Exception as e:
+            self.post(self.ERROR, str(e))
+            self.log(f"Setup error: {str(e)}")
+    
+    def capture_qr(self, driver, wait):
+        """Capture the QR code from WhatsApp Web and post it for display"""
+        try:
+            self.log("=== QR Code Capture Debug ===")
+            
+            # Check page status
+            try:
+                self.log(f"Page title: {driver.title}")
+                self.log(f"Current URL: {driver.current_url}")
+            except Exception as e:
+                self.log(f"Could not get page info: {e}")
+            
+            # Poll until the QR canvas (or an already logged-in chat list) shows up
+            self.log("Waiting for QR code to load...")
+            try:
+                qr_element = wait.until(
+                    _FirstVisible(
+                        (By.CSS_SELECTOR, f"{QR_CANVAS_SELECTOR}, {LOGGED_IN_SELECTOR}"),
+                        (By.CSS_SELECTOR, QR_CANVAS_FALLBACK_SELECTOR),
+                    )
+                )
+            except TimeoutException:
+                qr_element = None
+            
+            if qr_element and qr_element.tag_name != 'canvas':
+                self.log("Already logged in - no QR code to scan")
+                return
+            
+            if not qr_element:
+                self.log("❌ ERROR: Could not find QR code element with any selector")
+                self.post(
+                    self.QR_UNAVAILABLE,
+                    "QR Code is in the browser window\n(Could not capture automatically)\n\nCheck Activity Log for details"
+                )
+                return
+            
+            self.log("✓ SUCCESS: Found QR code canvas")
+            
+            # Take screenshot of the QR code element
+            self.log("Capturing QR code screenshot...")
+            qr_png_b64 = self.element_png_b64(driver, qr_element)
+            
+            # Tk decodes the PNG and scales it on the Tk thread
+            self.post(self.QR_READY, qr_png_b64)
+            self.log("✓ QR code captured and displayed - should be scannable now!")
+            self.log("=== QR Code Capture Complete ===")
+            
+        except Exception as e:
+            self.log(f"❌ ERROR: Could not capture QR code: {str(e)}")
+            import traceback
+            self.log(traceback.format_exc())
+            self.post(
+                self.QR_UNAVAILABLE,
+                f"Could not capture QR code automatically.\n\nError: {str(e)}\n\nCheck Activity Log for details"
+            )
+    
+    def element_png_b64(self, driver, element):
+        """
+        Base64 PNG of one element
+        Chrome's DevTools screenshot clips straight to the element; other
+        drivers use Selenium's generic element screenshot
+        """
+        if hasattr(driver, 'execute_cdp_cmd'):
+            try:
+                rect = element.rect
+                result = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                    "format": "png",
+                    "clip": {
+                        "x": rect['x'],
+                        "y": rect['y'],
+                        "width": rect['width'],
+                        "height": rect['height'],
+                        "scale": 1,
+                    },
+                })
+                return result['data']
+            except Exception as e:
+                self.log(f"DevTools screenshot failed, falling back: {e}")
+        
+        return element.screenshot_as_base64
+
+# Repeated list refreshes within this window are coalesced
+REFRESH_DEBOUNCE_MS = 150
+
+# Reminder rows inserted per idle callback - roughly one screenful
+TREE_BATCH_ROWS = 50
+
+# Activity log is flushed from a queue on the Tk thread
+LOG_DRAIN_INTERVAL_MS = 100
+LOG_DRAIN_BATCH = 500
+MAX_LOG_LINES = 2000
+
+# Help > Instructions text, formatted once at import
+INSTRUCTIONS_TEXT = f"""
+{config.APP_NAME} - Quick Start Guide
+
+STEP 1: ADD CONTACTS
+   - Go to Contacts tab
+   - Enter name and phone number
+   - Phone MUST include country code (+27 for South Africa)
+   - Example: +27821234567
+   - Click "Save Contact"
+
+STEP 2: CREATE REMINDERS
+   - Go to Reminders tab
+   - Select a contact from dropdown
+   - Set the time (24-hour format)
+   - Choose frequency:
+     * Once - Send one time only
+     * Daily - Every day at that time
+     * Weekdays - Monday to Friday only
+     * Weekly - Once per week
+     * Monthly - Specific day each month (select day 1-31)
+     * Yearly - Specific date each year (select month + day)
+   - For Monthly/Yearly: Date fields appear automatically
+   - Type your message
+   - Click "Create Reminder"
+
+STEP 3: TEST
+   - Menu > File > Test Connection
+   - Select which contact to test with
+   - Customize the test message if desired
+   - Check Activity Log to see if it worked
+
+STEP 4: USE
+   - Keep this application running
+   - Messages will send automatically
+   - Check Activity Log for sent messages
+   - You can minimize the window
+
+MONTHLY/YEARLY REMINDERS:
+   - Select "Monthly" to choose day (1-31)
+   - Select "Yearly" to choose month and day
+   - Example: Monthly day 15 = 15th of every month
+   - Example: Yearly June 15 = June 15 every year
+
+MINIMIZE TO TRAY:
+   - File > Minimize to Tray
+   - App runs completely hidden
+   - Right-click tray icon to access features
+
+TIPS:
+- Browser runs in background (headless mode)
+- Uses minimal resources - won't affect gaming
+- First time only: You scanned QR code during setup
+- If WhatsApp disconnects: File > Reset WhatsApp Login
+- If QR code is too small: Resize the setup window
+
+PHONE NUMBER FORMAT:
+   South Africa: +27821234567
+   USA: +12125551234
+   UK: +447700900123
+"""
+
 class WhatsAppReminderGUI:
     """Main GUI application"""
     
@@ -37,20 +335,35 @@ class WhatsAppReminderGUI:
         self.root.title(config.APP_NAME)
         self.root.geometry("800x600")
         
+        # Log lines from any thread, written to the widget in batches
+        self._log_q = queue.Queue()
+        
         # Initialize components
         self.db = DatabaseManager()
+        
+        # Settings cache - loaded in one query, written through to the DB
+        self._settings = dict(self.db.get_all_settings())
         self.whatsapp = WhatsAppService(self.log_message)
         self.scheduler = SchedulerService(self.db, self.whatsapp, self.log_message)
         
-        # Initialize tray icon variable
+        # Initialize tray icon variable (created once, under _tray_lock)
         self.tray_icon = None
+        self._tray_lock = threading.Lock()
+        self._tray_ready = threading.Event()
+        
+        # One-shot background jobs (test sends, missed-reminder checks)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gui-job")
+        
+        # Refreshes already scheduled by _debounce()
+        self._pending_refresh = set()
         
         # Create GUI
         self.create_menu()
         self.create_widgets()
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_log)
         
         # Check if first time setup needed
-        is_setup = self.db.get_setting("whatsapp_setup_complete", "false")
+        is_setup = self.get_setting("whatsapp_setup_complete", "false")
         if is_setup == "false":
             self.show_first_time_setup()
         else:
@@ -69,22 +382,8 @@ class WhatsAppReminderGUI:
         if not PYSTRAY_AVAILABLE or not PIL_AVAILABLE:
             return None
         
-        # Create a simple icon (you can replace with a custom image later)
-        # Create a 64x64 icon with "WA" text
-        image = Image.new('RGB', (64, 64), color='#25D366')  # WhatsApp green
-        draw = ImageDraw.Draw(image)
-        
-        # Draw white text
-        try:
-            # Try to use a font if available
-            from PIL import ImageFont
-            try:
-                font = ImageFont.truetype("arial.ttf", 36)
-                draw.text((8, 10), "WA", fill='white', font=font)
-            except:
-                draw.text((8, 20), "WA", fill='white')
-        except:
-            draw.text((8, 20), "WA", fill='white')
+        # Static icon, rendered on first use and cached
+        image = _build_tray_image()
         
         # Create tray icon menu
         menu = (
@@ -125,11 +424,18 @@ class WhatsAppReminderGUI:
         self.log_message("Minimized to system tray")
         
         # Start tray icon if not already running
-        if not self.tray_icon:
+        with self._tray_lock:
+            if self._tray_ready.is_set():
+                return
+            
             self.tray_icon = self.create_tray_icon()
             if self.tray_icon:
-                # Run tray icon in separate thread
-                threading.Thread(target=self.tray_icon.run, daemon=True).start()
+                # Let pystray drive its own loop; older versions need a thread
+                if hasattr(self.tray_icon, 'run_detached'):
+                    self.tray_icon.run_detached()
+                else:
+                    threading.Thread(target=self.tray_icon.run, daemon=True).start()
+                self._tray_ready.set()
     
     def test_connection_from_tray(self, icon=None, item=None):
         """Test connection from tray menu"""
@@ -255,232 +561,110 @@ STEP 4: Click "Setup Complete" when ready
     
     def start_whatsapp_setup(self):
         """Start WhatsApp setup process"""
+        if not SELENIUM_AVAILABLE:
+            self.setup_status.config(text="Status: selenium not installed", fg="red")
+            return
+        
         self.setup_status.config(text="Status: Opening browser and loading WhatsApp Web...", fg="orange")
         self.start_setup_btn.config(state=tk.DISABLED)
         self.qr_label.config(text="Loading WhatsApp Web...", bg="lightyellow")
         
-        def setup_thread():
-            try:
-                self.log_message("Starting WhatsApp Web setup...")
-                
-                # Initialize browser
-                if not self.scheduler.whatsapp.init_browser():
-                    self.setup_status.config(
-                        text="Status: Failed to start browser",
-                        fg="red"
-                    )
-                    self.start_setup_btn.config(state=tk.NORMAL)
-                    return
-                
-                # Open WhatsApp Web
-                self.scheduler.whatsapp.driver.get(config.WHATSAPP_WEB_URL)
-                self.setup_status.config(text="Status: Loading WhatsApp Web...", fg="orange")
-                
-                # Wait a moment for page to load
-                time.sleep(3)
-                
-                # Try to capture QR code
-                self.capture_and_display_qr()
-                
-                # Check if logged in (wait up to 60 seconds)
-                self.setup_status.config(text="Status: Waiting for QR code scan...", fg="orange")
-                
-                from selenium.webdriver.common.by import By
-                from selenium.webdriver.support.ui import WebDriverWait
-                from selenium.webdriver.support import expected_conditions as EC
-                
-                try:
-                    # Wait for the search box (indicates logged in)
-                    wait = WebDriverWait(self.scheduler.whatsapp.driver, 60)
-                    wait.until(
-                        EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]'))
-                    )
-                    
-                    # Success!
-                    self.scheduler.whatsapp.is_logged_in = True
-                    self.setup_status.config(
-                        text="Status: Successfully logged in! Click 'Setup Complete' below",
-                        fg="green"
-                    )
-                    self.qr_label.config(
-                        text="✓ Login Successful!\n\nYou can now click 'Setup Complete'",
-                        bg="lightgreen",
-                        font=("Arial", 12, "bold")
-                    )
-                    self.complete_setup_btn.config(state=tk.NORMAL)
-                    self.log_message("WhatsApp Web login successful!")
-                    
-                except Exception as e:
-                    # Timeout or error
-                    self.setup_status.config(
-                        text="Status: Please scan QR code, then click 'Setup Complete'",
-                        fg="orange"
-                    )
-                    self.complete_setup_btn.config(state=tk.NORMAL)
-                    self.log_message("Waiting for QR code scan...")
-                
-            except Exception as e:
-                self.setup_status.config(
-                    text=f"Status: Error - {str(e)}",
-                    fg="red"
-                )
-                self.qr_label.config(text=f"Error: {str(e)}", bg="pink")
-                self.start_setup_btn.config(state=tk.NORMAL)
-                self.log_message(f"Setup error: {str(e)}")
-        
-        threading.Thread(target=setup_thread, daemon=True).start()
-    
-    def capture_and_display_qr(self):
-        """Capture QR code from WhatsApp Web and display it - IMPROVED VERSION"""
-        if not PIL_AVAILABLE:
-            self.qr_label.config(
-                text="QR Code is displayed in the browser window\n(Pillow not installed for in-app display)",
-                bg="lightyellow"
-            )
-            return
+        # Worker reports progress through the queue; widgets are only touched here
+        self._setup_queue = queue.Queue()
+        _SetupWorker(self.scheduler.whatsapp, self._setup_queue, self.log_message).start()
+        self.root.after(SETUP_POLL_INTERVAL_MS, self._poll_setup)
+    
+    def _poll_setup(self):
+        """Apply queued setup state changes, then reschedule until setup finishes"""
+        if not self.setup_window.winfo_exists():
+            return  # Setup window was closed (Skip)
         
         try:
-            from selenium.webdriver.common.by import By
-            
-            self.log_message("=== QR Code Capture Debug ===")
-            
-            # Wait longer for QR code to appear
-            self.log_message("Waiting 7 seconds for QR code to load...")
-            time.sleep(7)  # ✅ INCREASED: Give more time for WhatsApp to load
-            
-            # Check page status
-            try:
-                page_title = self.scheduler.whatsapp.driver.title
-                self.log_message(f"Page title: {page_title}")
-                current_url = self.scheduler.whatsapp.driver.current_url
-                self.log_message(f"Current URL: {current_url}")
-            except Exception as e:
-                self.log_message(f"Could not get page info: {e}")
-            
-            # Look for ALL canvas elements first
-            try:
-                canvases = self.scheduler.whatsapp.driver.find_elements(By.TAG_NAME, "canvas")
-                self.log_message(f"Found {len(canvases)} canvas elements on page")
-                
-                for i, canvas in enumerate(canvases):
-                    try:
-                        size = canvas.size
-                        location = canvas.location
-                        is_displayed = canvas.is_displayed()
-                        self.log_message(f"Canvas {i}: {size['width']}x{size['height']} at ({location['x']}, {location['y']}) - Displayed: {is_displayed}")
-                    except:
-                        pass
-            except Exception as e:
-                self.log_message(f"Error checking canvases: {e}")
-            
-            # Try multiple selectors in priority order
-            qr_element = None
-            selectors = [
-                ('//canvas[@aria-label="Scan this QR code to link a device!"]', "Official QR aria-label"),
-                ('//canvas[@role="img"]', "Canvas with role=img"),
-                ('//div[contains(@class, "landing-wrapper")]//canvas', "Landing wrapper canvas"),
-                ('//div[@data-ref]//canvas', "Data-ref canvas"),
-                ('//canvas[contains(@style, "cursor")]', "Canvas with cursor style"),
-                ('//canvas', "Any canvas element")
-            ]
-            
-            for xpath, description in selectors:
-                try:
-                    self.log_message(f"Trying selector: {description}")
-                    elements = self.scheduler.whatsapp.driver.find_elements(By.XPATH, xpath)
-                    
-                    if elements:
-                        self.log_message(f"  Found {len(elements)} element(s)")
-                        # Use the first visible one
-                        for elem in elements:
-                            if elem.is_displayed() and elem.size['width'] > 0:
-                                qr_element = elem
-                                self.log_message(f"✓ SUCCESS: Using {description}")
-                                break
-                    
-                    if qr_element:
-                        break
-                        
-                except Exception as e:
-                    self.log_message(f"  Failed: {str(e)}")
-                    continue
-            
-            if not qr_element:
-                self.log_message("❌ ERROR: Could not find QR code element with any selector")
-                self.qr_label.config(
-                    text="QR Code is in the browser window\n(Could not capture automatically)\n\nCheck Activity Log for details",
-                    bg="lightyellow",
-                    fg="red"
-                )
-                return
-            
-            # Take screenshot of the QR code element
-            self.log_message("Capturing QR code screenshot...")
-            qr_png = qr_element.screenshot_as_png
-            
-            # Convert to PIL Image
-            qr_image = Image.open(io.BytesIO(qr_png))
-            
-            # Get original size
-            original_width, original_height = qr_image.size
-            self.log_message(f"Original QR code size: {original_width}x{original_height}")
-            
-            # Target size for scannable QR code - make it LARGE
-            target_size = 500
-            
-            # Calculate scaling factor
-            scale_factor = target_size / min(original_width, original_height)
-            
-            # Always scale to make QR code large and scannable
-            if scale_factor != 1:
-                new_width = int(original_width * scale_factor)
-                new_height = int(original_height * scale_factor)
-                
-                # Use NEAREST for QR codes (keeps sharp edges)
-                qr_image = qr_image.resize((new_width, new_height), Image.Resampling.NEAREST)
-                self.log_message(f"Scaled QR code to: {new_width}x{new_height}")
-            
-            # If still too small, scale up more
-            if qr_image.size[0] < 400:
-                scale_more = 500 / qr_image.size[0]
-                new_width = int(qr_image.size[0] * scale_more)
-                new_height = int(qr_image.size[1] * scale_more)
-                qr_image = qr_image.resize((new_width, new_height), Image.Resampling.NEAREST)
-                self.log_message(f"Scaled QR code AGAIN to: {new_width}x{new_height}")
-            
-            # Convert to PhotoImage
-            qr_photo = ImageTk.PhotoImage(qr_image)
-            
-            # Display in label (clear text, show image only)
-            self.qr_label.config(image=qr_photo, text="", bg="white")
-            self.qr_label.image = qr_photo  # Keep a reference!
-            
-            final_width, final_height = qr_image.size
-            self.log_message(f"QR code displayed at: {final_width}x{final_height} pixels")
-            
-            self.setup_status.config(text="Status: Scan the QR code with your phone", fg="orange")
-            self.log_message("✓ QR code captured and displayed - should be scannable now!")
-            self.log_message("=== QR Code Capture Complete ===")
-            
-        except Exception as e:
-            self.log_message(f"❌ ERROR: Could not capture QR code: {str(e)}")
-            import traceback
-            self.log_message(traceback.format_exc())
-            self.qr_label.config(
-                text=f"Could not capture QR code automatically.\n\nError: {str(e)}\n\nCheck Activity Log for details",
-                bg="lightyellow",
-                fg="red",
-                font=("Arial", 10, "bold")
-            )
+            while True:
+                state, payload = self._setup_queue.get_nowait()
+                getattr(self, f"_on_setup_{state}")(payload)
+                if state in _SetupWorker.FINAL_STATES:
+                    return
+        except queue.Empty:
+            pass
+        
+        self.root.after(SETUP_POLL_INTERVAL_MS, self._poll_setup)
+    
+    def _on_setup_loading_page(self, payload):
+        """Browser is up, page is loading"""
+        self.setup_status.config(text="Status: Loading WhatsApp Web...", fg="orange")
+    
+    def _on_setup_qr_ready(self, qr_png_b64):
+        """Show the captured QR code"""
+        qr_photo = tk.PhotoImage(data=qr_png_b64)
+        width, height = qr_photo.width(), qr_photo.height()
+        self.log_message(f"Original QR code size: {width}x{height}")
+        
+        # Whole-number zoom inside Tk keeps QR modules sharp and equal-sized
+        factor = max(1, QR_TARGET_SIZE // min(width, height))
+        if factor > 1:
+            qr_photo = qr_photo.zoom(factor)
+            self.log_message(f"Scaled QR code to: {width * factor}x{height * factor} (x{factor})")
+        
+        # Display in label (clear text, show image only)
+        self.qr_label.config(image=qr_photo, text="", bg="white")
+        self.qr_label.image = qr_photo  # Keep a reference!
+        self.setup_status.config(text="Status: Scan the QR code with your phone", fg="orange")
+    
+    def _on_setup_qr_unavailable(self, text):
+        """QR could not be shown in-app"""
+        self.qr_label.config(text=text, bg="lightyellow", fg="red")
+    
+    def _on_setup_waiting_qr(self, payload):
+        """Waiting for the phone to scan"""
+        self.setup_status.config(text="Status: Waiting for QR code scan...", fg="orange")
+    
+    def _on_setup_logged_in(self, payload):
+        """Login detected"""
+        self.setup_status.config(
+            text="Status: Successfully logged in! Click 'Setup Complete' below",
+            fg="green"
+        )
+        self.qr_label.config(
+            text="✓ Login Successful!\n\nYou can now click 'Setup Complete'",
+            bg="lightgreen",
+            font=("Arial", 12, "bold")
+        )
+        self.complete_setup_btn.config(state=tk.NORMAL)
+    
+    def _on_setup_scan_pending(self, payload):
+        """Login not detected yet - let the user confirm manually"""
+        self.setup_status.config(
+            text="Status: Please scan QR code, then click 'Setup Complete'",
+            fg="orange"
+        )
+        self.complete_setup_btn.config(state=tk.NORMAL)
+    
+    def _on_setup_browser_failed(self, payload):
+        """Browser could not be started"""
+        self.setup_status.config(text="Status: Failed to start browser", fg="red")
+        self.start_setup_btn.config(state=tk.NORMAL)
+    
+    def _on_setup_error(self, error):
+        """Unexpected setup failure"""
+        self.setup_status.config(text=f"Status: Error - {error}", fg="red")
+        self.qr_label.config(text=f"Error: {error}", bg="pink")
+        self.start_setup_btn.config(state=tk.NORMAL)
     
     def complete_whatsapp_setup(self):
         """Complete WhatsApp setup"""
-        # Mark setup as complete
-        self.db.set_setting("whatsapp_setup_complete", "true")
+        self.complete_setup_btn.config(state=tk.DISABLED)
         
-        # Start scheduler
-        self.scheduler.start()
+        def persist():
+            # Mark setup as complete and start scheduler, off the Tk thread
+            self.set_setting("whatsapp_setup_complete", "true")
+            self.scheduler.start()
+            self._ui(self._on_setup_persisted)
         
+        self._executor.submit(persist)
+    
+    def _on_setup_persisted(self):
+        """Setup flag saved and scheduler running - tell the user"""
         self.log_message("Setup complete! You can now use the application.")
         
         messagebox.showinfo(
@@ -532,28 +716,32 @@ STEP 4: Click "Setup Complete" when ready
             "Reset WhatsApp",
             "This will log you out of WhatsApp Web and require you to scan QR code again.\n\nContinue?"
         ):
-            # Stop scheduler
-            self.scheduler.stop()
-            
-            # Clear browser data
-            import shutil
-            browser_data = config.BASE_DIR / "browser_data"
-            if browser_data.exists():
-                try:
-                    shutil.rmtree(browser_data)
-                    self.log_message("Browser data cleared")
-                except Exception as e:
-                    self.log_message(f"Error clearing browser data: {e}")
-            
-            # Reset setup flag
-            self.db.set_setting("whatsapp_setup_complete", "false")
-            
-            # Restart scheduler
-            self.whatsapp = WhatsAppService(self.log_message)
-            self.scheduler = SchedulerService(self.db, self.whatsapp, self.log_message)
+            def reset():
+                # Stopping the scheduler can wait on a send - keep it off the Tk thread
+                if not self.scheduler.reset():
+                    self.log_message("Reset cancelled: the scheduler is still sending, try again shortly")
+                    return
+                
+                # Close the browser (it holds the profile dir open)
+                self.whatsapp.reset()
+                
+                # Clear browser data
+                import shutil
+                browser_data = config.BROWSER_DATA_DIR
+                if browser_data.exists():
+                    try:
+                        shutil.rmtree(browser_data)
+                        self.log_message("Browser data cleared")
+                    except Exception as e:
+                        self.log_message(f"Error clearing browser data: {e}")
+                
+                # Reset setup flag
+                self.set_setting("whatsapp_setup_complete", "false")
+                
+                # Show setup wizard
+                self._ui(self.show_first_time_setup)
             
-            # Show setup wizard
-            self.show_first_time_setup()
+            self._executor.submit(reset)
     
     # =========================================================================
     # MAIN WIDGETS
@@ -562,14 +750,26 @@ STEP 4: Click "Setup Complete" when ready
     def create_widgets(self):
         """Create main widgets"""
         # Create notebook (tabs)
-        notebook = ttk.Notebook(self.root)
+        notebook = self.notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Create tabs
+        # Lists whose refresh was skipped while their tab was hidden
+        self._dirty = {'contacts': False, 'reminders': False}
+        self._reminders_generation = 0
+        
+        # Tree item id -> (reminder_id, is_active) for the rows on screen
+        self._reminder_meta = {}
+        self._reminder_rows = None
+        
+        # Create tabs - Reminders is only built the first time it is opened
+        self.reminders_built = False
         self.create_contacts_tab(notebook)
-        self.create_reminders_tab(notebook)
+        self.reminders_frame = ttk.Frame(notebook)
+        notebook.add(self.reminders_frame, text="Reminders")
         self.create_log_tab(notebook)
         
+        notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        
         # Status bar
         self.status_bar = tk.Label(
             self.root,
@@ -584,8 +784,9 @@ STEP 4: Click "Setup Complete" when ready
     
     def create_contacts_tab(self, notebook):
         """Create contacts tab"""
-        frame = ttk.Frame(notebook)
+        frame = self.contacts_frame = ttk.Frame(notebook)
         notebook.add(frame, text="Contacts")
+        notebook.select(frame)  # Start-up tab, so load_contacts() sees it as visible
         
         # Left: Contact list
         left = ttk.Frame(frame)
@@ -605,13 +806,15 @@ STEP 4: Click "Setup Complete" when ready
         scrollbar.config(command=self.contacts_list.yview)
         self.contacts_list.bind('<<ListboxSelect>>', self.on_contact_select)
         
-        # Dictionary to map listbox index to contact_id
-        self.contact_id_map = {}
+        # (id, name, phone, notes) rows shared by every contact view, see _contacts();
+        # listbox index -> contact_id
+        self._contacts_cache = None
+        self.contact_ids = []
         
         # Buttons
         btn_frame = ttk.Frame(left)
         btn_frame.pack(fill=tk.X)
-        ttk.Button(btn_frame, text="Refresh", command=self.load_contacts).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btn_frame, text="Refresh", command=self.refresh_contacts).pack(side=tk.LEFT, padx=2)
         ttk.Button(btn_frame, text="New", command=self.clear_contact_form).pack(side=tk.LEFT, padx=2)
         ttk.Button(btn_frame, text="Delete", command=self.delete_contact).pack(side=tk.LEFT, padx=2)
         
@@ -637,11 +840,23 @@ STEP 4: Click "Setup Complete" when ready
         self.selected_contact_id = None
         self.load_contacts()
     
-    def create_reminders_tab(self, notebook):
-        """Create reminders tab"""
-        frame = ttk.Frame(notebook)
-        notebook.add(frame, text="Reminders")
-        
+    def _tab_visible(self, frame):
+        """True if frame is the notebook's current tab"""
+        return self.notebook.select() == str(frame)
+    
+    def on_tab_changed(self, event):
+        """Build the Reminders tab on first activation, catch up on skipped refreshes"""
+        if self._tab_visible(self.reminders_frame):
+            if not self.reminders_built:
+                self.reminders_built = True
+                self.create_reminders_tab(self.reminders_frame)
+            elif self._dirty['reminders']:
+                self.load_reminders()
+        elif self._tab_visible(self.contacts_frame) and self._dirty['contacts']:
+            self.load_contacts()
+    
+    def create_reminders_tab(self, frame):
+        """Create reminders tab contents inside its (already added) frame"""
         # Top: Reminder list
         top = ttk.Frame(frame)
         top.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -703,10 +918,7 @@ STEP 4: Click "Setup Complete" when ready
         self.day_spinbox.insert(0, "1")
         
         self.month_label = tk.Label(form, text="Month:")
-        self.month_combo = ttk.Combobox(form, width=15, state='readonly',
-                                       values=["January", "February", "March", "April", 
-                                              "May", "June", "July", "August",
-                                              "September", "October", "November", "December"])
+        self.month_combo = ttk.Combobox(form, width=15, state='readonly', values=config.MONTHS)
         self.month_combo.current(0)
         
         self.year_day_label = tk.Label(form, text="Day:")
@@ -714,6 +926,16 @@ STEP 4: Click "Setup Complete" when ready
         self.year_day_spinbox.delete(0, tk.END)
         self.year_day_spinbox.insert(0, "1")
         
+        # Date pickers per frequency (widget -> grid column on row 1)
+        self._freq_widgets = {
+            "Monthly": {self.day_label: 2, self.day_spinbox: 3},
+            "Yearly": {
+                self.month_label: 2, self.month_combo: 3,
+                self.year_day_label: 4, self.year_day_spinbox: 5,
+            },
+        }
+        self._visible_freq_widgets = {}
+        
         ttk.Label(form, text="Message:").grid(row=2, column=0, sticky=tk.NW, padx=5, pady=5)
         self.message = tk.Text(form, width=60, height=4)
         self.message.grid(row=2, column=1, columnspan=3, padx=5, pady=5)
@@ -739,16 +961,35 @@ STEP 4: Click "Setup Complete" when ready
     # CONTACT OPERATIONS
     # =========================================================================
     
+    def _contacts(self):
+        """Cached (id, name, phone, notes) rows - queried again only after a change"""
+        if self._contacts_cache is None:
+            self._contacts_cache = tuple(self.db.get_all_contacts())
+        return self._contacts_cache
+    
+    def refresh_contacts(self):
+        """Drop the contacts cache and reload (Refresh button)"""
+        self._contacts_cache = None
+        self.load_contacts()
+    
     def load_contacts(self):
-        """Load contacts into list"""
+        """Reload the contact list - rapid repeat calls collapse into one"""
+        if not self._tab_visible(self.contacts_frame):
+            self._dirty['contacts'] = True
+            return  # Reloaded when the tab is next shown
+        
+        self._dirty['contacts'] = False
+        self._debounce('contacts', self._load_contacts_now)
+    
+    def _load_contacts_now(self):
+        """Load contacts into list (and the reminder dropdown, from the same rows)"""
+        contacts = self._contacts()
+        self.contact_ids = [c[0] for c in contacts]
+        
         self.contacts_list.delete(0, tk.END)
-        self.contact_id_map.clear()
-        contacts = self.db.get_all_contacts()
+        self.contacts_list.insert(tk.END, *(f"{name} ({phone})" for _, name, phone, _ in contacts))
         
-        for idx, contact in enumerate(contacts):
-            contact_id, name, phone, notes = contact
-            self.contacts_list.insert(tk.END, f"{name} ({phone})")
-            self.contact_id_map[idx] = contact_id
+        self.load_reminder_contacts()
     
     def on_contact_select(self, event):
         """Handle contact selection"""
@@ -757,18 +998,17 @@ STEP 4: Click "Setup Complete" when ready
             return
         
         idx = selection[0]
-        if idx in self.contact_id_map:
-            contact_id = self.contact_id_map[idx]
-            contact = self.db.get_contact(contact_id)
-            
-            if contact:
-                self.selected_contact_id = contact_id
-                self.contact_name.delete(0, tk.END)
-                self.contact_name.insert(0, contact[1])
-                self.contact_phone.delete(0, tk.END)
-                self.contact_phone.insert(0, contact[2])
-                self.contact_notes.delete(1.0, tk.END)
-                self.contact_notes.insert(1.0, contact[3] or "")
+        contacts = self._contacts()
+        if idx < len(contacts):
+            # Row is already in the cache - no need to query it again
+            contact_id, name, phone, notes = contacts[idx]
+            self.selected_contact_id = contact_id
+            self.contact_name.delete(0, tk.END)
+            self.contact_name.insert(0, name)
+            self.contact_phone.delete(0, tk.END)
+            self.contact_phone.insert(0, phone)
+            self.contact_notes.delete(1.0, tk.END)
+            self.contact_notes.insert(1.0, notes or "")
     
     def save_contact(self):
         """Save contact"""
@@ -795,9 +1035,9 @@ STEP 4: Click "Setup Complete" when ready
             else:
                 messagebox.showerror("Error", "Phone already exists!")
         
+        self._contacts_cache = None
         self.clear_contact_form()
         self.load_contacts()
-        self.load_reminder_contacts()
     
     def clear_contact_form(self):
         """Clear contact form"""
@@ -815,13 +1055,14 @@ STEP 4: Click "Setup Complete" when ready
         
         if messagebox.askyesno("Confirm", "Delete contact and reminders?"):
             idx = selection[0]
-            if idx in self.contact_id_map:
-                contact_id = self.contact_id_map[idx]
+            if idx < len(self.contact_ids):
+                contact_id = self.contact_ids[idx]
                 self.db.delete_contact(contact_id)
+                self.scheduler.notify()
+                self._contacts_cache = None
                 self.clear_contact_form()
                 self.load_contacts()
                 self.load_reminders()
-                self.load_reminder_contacts()
                 messagebox.showinfo("Success", "Contact deleted!")
     
     # =========================================================================
@@ -829,9 +1070,11 @@ STEP 4: Click "Setup Complete" when ready
     # =========================================================================
     
     def load_reminder_contacts(self):
-        """Load contacts for reminder dropdown"""
-        contacts = self.db.get_all_contacts()
-        contact_list = [f"{c[1]} ({c[2]})" for c in contacts]
+        """Load contacts for reminder dropdown (from the contacts cache)"""
+        if not self.reminders_built:
+            return  # Loaded when the tab is first opened
+        
+        contact_list = [f"{name} ({phone})" for _, name, phone, _ in self._contacts()]
         self.reminder_contact['values'] = contact_list
         if contact_list:
             self.reminder_contact.current(0)
@@ -840,27 +1083,13 @@ STEP 4: Click "Setup Complete" when ready
         """Show/hide date pickers based on frequency selection"""
         freq = self.frequency.get()
         
-        # Hide all date fields first
-        self.day_label.grid_remove()
-        self.day_spinbox.grid_remove()
-        self.month_label.grid_remove()
-        self.month_combo.grid_remove()
-        self.year_day_label.grid_remove()
-        self.year_day_spinbox.grid_remove()
-        
-        # Show appropriate fields based on frequency
-        if freq == "Monthly":
-            # Show day picker only
-            self.day_label.grid(row=1, column=2, sticky='w', padx=5, pady=5)
-            self.day_spinbox.grid(row=1, column=3, sticky='w', padx=5, pady=5)
-        
-        elif freq == "Yearly":
-            # Show month picker on row 1
-            self.month_label.grid(row=1, column=2, sticky='w', padx=5, pady=5)
-            self.month_combo.grid(row=1, column=3, sticky='w', padx=5, pady=5)
-            # Show day picker on same row
-            self.year_day_label.grid(row=1, column=4, sticky='w', padx=5, pady=5)
-            self.year_day_spinbox.grid(row=1, column=5, sticky='w', padx=5, pady=5)
+        # Only touch the widgets whose visibility actually changes
+        wanted = self._freq_widgets.get(freq, {})
+        for widget in self._visible_freq_widgets.keys() - wanted.keys():
+            widget.grid_remove()
+        for widget in wanted.keys() - self._visible_freq_widgets.keys():
+            widget.grid(row=1, column=wanted[widget], sticky='w', padx=5, pady=5)
+        self._visible_freq_widgets = wanted
     
     def create_reminder(self):
         """Create new reminder"""
@@ -868,14 +1097,11 @@ STEP 4: Click "Setup Complete" when ready
             messagebox.showerror("Error", "Select a contact!")
             return
         
-        # Get contact ID
+        # Get contact ID - dropdown entries line up with the contacts cache
         contact_text = self.reminder_contact.get()
-        contacts = self.db.get_all_contacts()
-        contact_id = None
-        for c in contacts:
-            if f"{c[1]} ({c[2]})" == contact_text:
-                contact_id = c[0]
-                break
+        idx = self.reminder_contact.current()
+        contacts = self._contacts()
+        contact_id = contacts[idx][0] if 0 <= idx < len(contacts) else None
         
         if not contact_id:
             messagebox.showerror("Error", "Invalid contact!")
@@ -895,24 +1121,20 @@ STEP 4: Click "Setup Complete" when ready
         schedule_day = None
         schedule_month = None
         
-        if freq == "Monthly":
-            try:
-                schedule_day = int(self.day_spinbox.get())
-            except:
-                schedule_day = 1
-        elif freq == "Yearly":
-            try:
-                month_name = self.month_combo.get()
-                month_map = {"January": 1, "February": 2, "March": 3, "April": 4,
-                           "May": 5, "June": 6, "July": 7, "August": 8,
-                           "September": 9, "October": 10, "November": 11, "December": 12}
-                schedule_month = month_map.get(month_name, 1)
-                schedule_day = int(self.year_day_spinbox.get())
-            except:
-                schedule_month = 1
-                schedule_day = 1
+        if freq in ("Monthly", "Yearly"):
+            spinbox = self.day_spinbox if freq == "Monthly" else self.year_day_spinbox
+            day = spinbox.get().strip()
+            if not day.isdigit():
+                messagebox.showerror("Error", "Day must be a number from 1 to 31!")
+                return
+            schedule_day = min(max(int(day), 1), 31)
+        
+        if freq == "Yearly":
+            # Combobox index is 0-based, months are 1-12
+            schedule_month = max(self.month_combo.current(), 0) + 1
         
         self.db.add_reminder(contact_id, message_text, schedule_time, freq, schedule_day, schedule_month)
+        self.scheduler.notify()
         self.message.delete(1.0, tk.END)
         self.load_reminders()
         
@@ -920,12 +1142,21 @@ STEP 4: Click "Setup Complete" when ready
         self.log_message(f"Created reminder for {contact_text} at {schedule_time}")
     
     def load_reminders(self):
-        """Load reminders"""
-        for item in self.reminders_tree.get_children():
-            self.reminders_tree.delete(item)
+        """Reload the reminder list - rapid repeat calls collapse into one"""
+        if not self.reminders_built:
+            return  # Loaded when the tab is first opened
         
-        reminders = self.db.get_all_reminders()
-        for reminder in reminders:
+        if not self._tab_visible(self.reminders_frame):
+            self._dirty['reminders'] = True
+            return  # Reloaded when the tab is next shown
+        
+        self._dirty['reminders'] = False
+        self._debounce('reminders', self._load_reminders_now)
+    
+    def _load_reminders_now(self):
+        """Load reminders - the first screenful now, the rest in idle-time batches"""
+        rows = []
+        for reminder in self.db.get_all_reminders():
             # Handle both old format (8 items) and new format (10 items with date fields)
             if len(reminder) == 10:  # New format with schedule_day and schedule_month
                 reminder_id, name, phone, msg, time, freq, sday, smonth, active, last = reminder
@@ -934,12 +1165,40 @@ STEP 4: Click "Setup Complete" when ready
                 sday, smonth = None, None
             
             status = "[ON] Active" if active else "[OFF] Inactive"
-            self.reminders_tree.insert(
+            rows.append((reminder_id, bool(active), (name, time, freq, status)))
+        
+        # Nothing visible changed - keep the tree as it is
+        if rows == self._reminder_rows:
+            return
+        self._reminder_rows = rows
+        
+        # One delete call for every row (none at all for an empty tree)
+        children = self.reminders_tree.get_children()
+        if children:
+            self.reminders_tree.delete(*children)
+        self._reminder_meta.clear()
+        
+        # A newer reload makes any batches still queued from this one stale
+        self._reminders_generation += 1
+        self._insert_reminder_rows(rows, 0, self._reminders_generation)
+    
+    def _insert_reminder_rows(self, rows, start, generation):
+        """Insert one batch of reminder rows and queue the next"""
+        if generation != self._reminders_generation:
+            return
+        
+        end = start + TREE_BATCH_ROWS
+        for reminder_id, active, values in rows[start:end]:
+            iid = self.reminders_tree.insert(
                 "", tk.END,
                 text=str(reminder_id),
-                values=(name, time, freq, status),
+                values=values,
                 tags=(str(reminder_id),)
             )
+            self._reminder_meta[iid] = (reminder_id, active)
+        
+        if end < len(rows):
+            self.root.after_idle(self._insert_reminder_rows, rows, end, generation)
     
     def toggle_reminder(self):
         """Toggle reminder"""
@@ -948,12 +1207,10 @@ STEP 4: Click "Setup Complete" when ready
             messagebox.showwarning("Warning", "Select a reminder!")
             return
         
-        item = selection[0]
-        reminder_id = int(self.reminders_tree.item(item, "text"))
-        values = self.reminders_tree.item(item, "values")
-        is_active = "Active" in values[3]
+        reminder_id, is_active = self._reminder_meta[selection[0]]
         
         self.db.toggle_reminder(reminder_id, not is_active)
+        self.scheduler.notify()
         self.load_reminders()
         messagebox.showinfo("Success", f"Reminder {'activated' if not is_active else 'deactivated'}!")
     
@@ -965,9 +1222,9 @@ STEP 4: Click "Setup Complete" when ready
             return
         
         if messagebox.askyesno("Confirm", "Delete reminder?"):
-            item = selection[0]
-            reminder_id = int(self.reminders_tree.item(item, "text"))
+            reminder_id, _ = self._reminder_meta[selection[0]]
             self.db.delete_reminder(reminder_id)
+            self.scheduler.notify()
             self.load_reminders()
             messagebox.showinfo("Success", "Reminder deleted!")
     
@@ -975,13 +1232,57 @@ STEP 4: Click "Setup Complete" when ready
     # UTILITY OPERATIONS
     # =========================================================================
     
+    def get_setting(self, key, default=None):
+        """Get setting value from the in-memory cache"""
+        return self._settings.get(key, default)
+    
+    def set_setting(self, key, value):
+        """Set setting value in the cache and the database"""
+        self.db.set_setting(key, value)
+        self._settings[key] = value
+    
+    def _debounce(self, key, fn):
+        """Run fn once after REFRESH_DEBOUNCE_MS, however often it is requested meanwhile"""
+        if key in self._pending_refresh:
+            return
+        self._pending_refresh.add(key)
+        
+        def run():
+            self._pending_refresh.discard(key)
+            fn()
+        
+        self.root.after(REFRESH_DEBOUNCE_MS, run)
+    
+    def _ui(self, fn, *args, **kwargs):
+        """Run a widget update on the Tk thread - safe to call from workers"""
+        try:
+            self.root.after(0, lambda: fn(*args, **kwargs))
+        except (RuntimeError, tk.TclError):
+            pass  # Main loop has already shut down
+    
     def log_message(self, message):
-        """Add to log"""
+        """Add to log (called from the scheduler and setup threads too)"""
+        self._log_q.put(message)
+    
+    def _drain_log(self):
+        """Write queued log lines to the widget in one insert, then reschedule"""
+        lines = []
         try:
-            self.log_text.insert(tk.END, message + "\n")
-            self.log_text.see(tk.END)
-        except:
+            while len(lines) < LOG_DRAIN_BATCH:
+                lines.append(self._log_q.get_nowait())
+        except queue.Empty:
             pass
+        
+        if lines:
+            try:
+                self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+                # Keep only the newest MAX_LOG_LINES lines (no-op while shorter)
+                self.log_text.delete("1.0", f"end-{MAX_LOG_LINES + 1}l")
+                self.log_text.see(tk.END)
+            except tk.TclError:
+                pass  # Widget already destroyed (window closing)
+        
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_log)
     
     def clear_log(self):
         """Clear log"""
@@ -989,7 +1290,7 @@ STEP 4: Click "Setup Complete" when ready
     
     def test_connection(self):
         """Test WhatsApp connection with contact selection"""
-        contacts = self.db.get_all_contacts()
+        contacts = self._contacts()
         if not contacts:
             messagebox.showerror("Error", "Add a contact first!")
             return
@@ -1029,13 +1330,8 @@ STEP 4: Click "Setup Complete" when ready
         contact_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=contact_listbox.yview)
         
-        # Populate contacts
-        contact_map = {}
-        for idx, contact in enumerate(contacts):
-            contact_id, name, phone, notes = contact
-            display_text = f"{name} ({phone})"
-            contact_listbox.insert(tk.END, display_text)
-            contact_map[idx] = contact
+        # Populate contacts in one insert; listbox index == contacts index
+        contact_listbox.insert(tk.END, *(f"{name} ({phone})" for _, name, phone, _ in contacts))
         
         # Select first contact by default
         contact_listbox.selection_set(0)
@@ -1065,7 +1361,7 @@ STEP 4: Click "Setup Complete" when ready
             
             # Store both contact and message
             idx = selection[0]
-            selected_data['contact'] = contact_map[idx]
+            selected_data['contact'] = contacts[idx]
             selected_data['message'] = message
             
             dialog.destroy()
@@ -1109,91 +1405,27 @@ STEP 4: Click "Setup Complete" when ready
                 success, error = self.scheduler.whatsapp.send_message(phone, message)
                 if success:
                     self.log_message("[SUCCESS] Test message sent!")
-                    messagebox.showinfo("Success", f"Test message sent successfully to {name}!")
+                    self._ui(messagebox.showinfo, "Success", f"Test message sent successfully to {name}!")
                 else:
                     self.log_message(f"[FAILED] Test error: {error}")
-                    messagebox.showerror("Failed", f"Test failed: {error}")
+                    self._ui(messagebox.showerror, "Failed", f"Test failed: {error}")
             
-            threading.Thread(target=send, daemon=True).start()
+            self._executor.submit(send)
     
     def check_missed(self):
         """Check for missed reminders"""
         self.log_message("Checking for missed reminders...")
-        threading.Thread(
-            target=self.scheduler.check_missed_reminders,
-            daemon=True
-        ).start()
+        self._executor.submit(self.scheduler.check_missed_reminders)
     
     def show_instructions(self):
         """Show instructions"""
-        msg = f"""
-{config.APP_NAME} - Quick Start Guide
-
-STEP 1: ADD CONTACTS
-   - Go to Contacts tab
-   - Enter name and phone number
-   - Phone MUST include country code (+27 for South Africa)
-   - Example: +27821234567
-   - Click "Save Contact"
-
-STEP 2: CREATE REMINDERS
-   - Go to Reminders tab
-   - Select a contact from dropdown
-   - Set the time (24-hour format)
-   - Choose frequency:
-     * Once - Send one time only
-     * Daily - Every day at that time
-     * Weekdays - Monday to Friday only
-     * Weekly - Once per week
-     * Monthly - Specific day each month (select day 1-31)
-     * Yearly - Specific date each year (select month + day)
-   - For Monthly/Yearly: Date fields appear automatically
-   - Type your message
-   - Click "Create Reminder"
-
-STEP 3: TEST
-   - Menu > File > Test Connection
-   - Select which contact to test with
-   - Customize the test message if desired
-   - Check Activity Log to see if it worked
-
-STEP 4: USE
-   - Keep this application running
-   - Messages will send automatically
-   - Check Activity Log for sent messages
-   - You can minimize the window
-
-MONTHLY/YEARLY REMINDERS:
-   - Select "Monthly" to choose day (1-31)
-   - Select "Yearly" to choose month and day
-   - Example: Monthly day 15 = 15th of every month
-   - Example: Yearly June 15 = June 15 every year
-
-MINIMIZE TO TRAY:
-   - File > Minimize to Tray
-   - App runs completely hidden
-   - Right-click tray icon to access features
-
-TIPS:
-- Browser runs in background (headless mode)
-- Uses minimal resources - won't affect gaming
-- First time only: You scanned QR code during setup
-- If WhatsApp disconnects: File > Reset WhatsApp Login
-- If QR code is too small: Resize the setup window
-
-PHONE NUMBER FORMAT:
-   South Africa: +27821234567
-   USA: +12125551234
-   UK: +447700900123
-        """
-        
         window = tk.Toplevel(self.root)
         window.title("Instructions")
         window.geometry("600x700")
         
         text = scrolledtext.ScrolledText(window, wrap=tk.WORD)
         text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        text.insert(1.0, msg)
+        text.insert(1.0, INSTRUCTIONS_TEXT)
         text.config(state=tk.DISABLED)
         
         ttk.Button(window, text="Close", command=window.destroy).pack(pady=10)
@@ -1223,13 +1455,24 @@ PHONE NUMBER FORMAT:
         if messagebox.askyesno("Quit", "Stop service and exit?"):
             self.log_message("Shutting down...")
             self.status_bar.config(text="Stopping scheduler...")
-            self.scheduler.stop()
+            # Ignore further close clicks while stopping
+            self.root.protocol("WM_DELETE_WINDOW", lambda: None)
             
             # Stop tray icon if running
             if self.tray_icon:
                 self.tray_icon.stop()
             
-            self.root.destroy()
+            # Drop queued jobs; don't wait on a send that is in flight
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            
+            # stop() can wait up to 10 s for a send, so it runs on its own
+            # thread (not the executor, whose workers may be busy) and the
+            # window closes once it returns
+            def stop():
+                self.scheduler.stop()
+                self._ui(self.root.destroy)
+            
+            threading.Thread(target=stop, name="gui-close", daemon=True).start()
 
 # =============================================================================
 # USAGE EXAMPLE
@@ -6,13 +6,21 @@ Run this file to start the application
 import tkinter as tk
 import sys
 import os
+import threading
+import importlib
+import importlib.util
 from pathlib import Path
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import config
-from gui import WhatsAppReminderGUI
+
+# Imported in a background thread while Tk starts up (selenium is slow to import)
+WARM_IMPORTS = (
+    'selenium.webdriver',
+    'webdriver_manager.chrome',
+)
 
 def setup_process_priority():
     """Set process priority for minimal resource usage"""
@@ -26,15 +34,13 @@ def check_dependencies():
     required = {
         'selenium': 'selenium',
         'webdriver_manager': 'webdriver-manager',
-        'schedule': 'schedule',
     }
     
     missing = []
     
+    # find_spec only locates the package, it doesn't run its code
     for module, package in required.items():
-        try:
-            __import__(module)
-        except ImportError:
+        if importlib.util.find_spec(module) is None:
             missing.append(package)
     
     if missing:
@@ -50,6 +56,14 @@ def check_dependencies():
     
     return True
 
+def _warm_imports():
+    """Import the heavy dependencies so the GUI import finds them cached"""
+    for module in WARM_IMPORTS:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass  # Reported properly when gui imports it
+
 def main():
     """Main application entry point"""
     
@@ -63,6 +77,11 @@ def main():
         input("\nPress Enter to exit...")
         return
     
+    threading.Thread(target=_warm_imports, daemon=True).start()
+    
+    # Log to file per config (rotating)
+    config.setup_logging()
+    
     # Set process priority
     setup_process_priority()
     
@@ -78,6 +97,7 @@ def main():
     
     # Create application
     try:
+        from gui import WhatsAppReminderGUI
         app = WhatsAppReminderGUI(root)
         
         print("\nApplication started successfully!")
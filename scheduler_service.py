@@ -3,17 +3,251 @@ Scheduler Service - Background reminder checking
 Runs independently and processes due reminders
 """
 
-import schedule
 import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import calendar
+import functools
 import logging
 import config
 from database import DatabaseManager
 from whatsapp_service import WhatsAppService
 
 logger = logging.getLogger(__name__)
+# Console/GUI output is done by SchedulerService.log; this only stops logging's
+# last-resort stderr handler repeating warnings when no file log is set up
+logger.addHandler(logging.NullHandler())
+
+# Timestamp format for console and log_callback lines
+LOG_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# A reminder this many seconds past its next_fire_ts is still sent on time;
+# later ones are sent late (if they fell due while the scheduler was running)
+# or left to check_missed_reminders (if it was down)
+DUE_GRACE_SECONDS = 60
+
+# Seconds past the minute boundary to wake, so a :00 fire time has passed
+MINUTE_ALIGN_OFFSET = 0.1
+
+# Never send the same reminder twice within this many seconds
+RESEND_GUARD_SECONDS = 300
+
+@functools.lru_cache(maxsize=256)
+def get_valid_day_for_month(year, month, desired_day):
+    """
+    Get valid day for a given month/year
+    If desired_day doesn't exist (e.g., Feb 31), return last day of month
+    
+    Args:
+        year: Year (e.g., 2024)
+        month: Month (1-12)
+        desired_day: Desired day (1-31)
+    
+    Returns:
+        Valid day for that month (1-31)
+    """
+    # Get number of days in the month
+    days_in_month = calendar.monthrange(year, month)[1]
+    
+    # Return the minimum of desired_day and days_in_month
+    return min(desired_day, days_in_month)
+
+def is_valid_time(hour, minute):
+    """True if hour/minute (as split from schedule_time) form a real time of day"""
+    return hour is not None and minute is not None and 0 <= hour < 24 and 0 <= minute < 60
+
+# =============================================================================
+# NEXT FIRE TIME
+# Each handler takes (after, after_ts, hour, minute, schedule_day,
+# schedule_month) and returns epoch seconds or None
+# =============================================================================
+
+def _next_on_days(after, after_ts, hour, minute, weekdays_only):
+    """First HH:MM after after_ts, optionally Monday-Friday only"""
+    day = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    # At most three weekend days to skip past
+    for _ in range(4):
+        if day.timestamp() > after_ts and (not weekdays_only or day.weekday() <= 4):
+            return int(day.timestamp())
+        day += timedelta(days=1)
+    return None
+
+def _next_daily(after, after_ts, hour, minute, schedule_day, schedule_month):
+    """Next HH:MM on any day (Once/Daily/Weekly)"""
+    return _next_on_days(after, after_ts, hour, minute, False)
+
+def _next_weekday(after, after_ts, hour, minute, schedule_day, schedule_month):
+    """Next HH:MM on a weekday"""
+    return _next_on_days(after, after_ts, hour, minute, True)
+
+def _next_monthly(after, after_ts, hour, minute, schedule_day, schedule_month):
+    """Next HH:MM on schedule_day (clamped to the month's length)"""
+    if schedule_day is None or not 1 <= schedule_day <= 31:
+        return None
+    year, month = after.year, after.month
+    for _ in range(2):
+        valid_day = get_valid_day_for_month(year, month, schedule_day)
+        fire = datetime(year, month, valid_day, hour, minute)
+        if fire.timestamp() > after_ts:
+            return int(fire.timestamp())
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return None
+
+def _next_yearly(after, after_ts, hour, minute, schedule_day, schedule_month):
+    """Next HH:MM on schedule_month/schedule_day"""
+    if schedule_month is None or schedule_day is None:
+        return None
+    if not (1 <= schedule_month <= 12 and 1 <= schedule_day <= 31):
+        return None
+    for year in (after.year, after.year + 1):
+        valid_day = get_valid_day_for_month(year, schedule_month, schedule_day)
+        fire = datetime(year, schedule_month, valid_day, hour, minute)
+        if fire.timestamp() > after_ts:
+            return int(fire.timestamp())
+    return None
+
+_NEXT_FIRE_HANDLERS = {
+    "Once": _next_daily,
+    "Daily": _next_daily,
+    "Weekdays": _next_weekday,
+    "Weekly": _next_daily,
+    "Monthly": _next_monthly,
+    "Yearly": _next_yearly,
+}
+
+def compute_next_fire(frequency, schedule_hour, schedule_minute, schedule_day, schedule_month,
+                      after_ts, last_sent_ts=None):
+    """
+    Get the first time a reminder fires strictly after after_ts
+    
+    Args:
+        frequency: One of config.FREQUENCIES
+        schedule_hour: Hour (0-23)
+        schedule_minute: Minute (0-59)
+        schedule_day: Day of month for Monthly/Yearly
+        schedule_month: Month (1-12) for Yearly
+        after_ts: Epoch seconds to search forward from
+        last_sent_ts: Epoch seconds of the last send, if any
+    
+    Returns:
+        Epoch seconds as an int, or None if the reminder never fires again
+    """
+    handler = _NEXT_FIRE_HANDLERS.get(frequency)
+    if handler is None or not is_valid_time(schedule_hour, schedule_minute):
+        return None
+    
+    if last_sent_ts:
+        if frequency == "Once":
+            return None
+        if frequency == "Weekly":
+            # Next slot on or after six days from the last send
+            after_ts = max(after_ts, last_sent_ts + 6 * 86400)
+    
+    try:
+        return handler(
+            datetime.fromtimestamp(after_ts), after_ts,
+            schedule_hour, schedule_minute, schedule_day, schedule_month
+        )
+    except ValueError:
+        return None  # Bad stored date; one row must not stop the scheduler
+
+# =============================================================================
+# MISSED REMINDERS
+# Each handler takes (window, reminder, hour, minute, last_sent_dt) and returns
+# the scheduled datetimes that fell inside the window
+# =============================================================================
+
+@dataclass(frozen=True, slots=True)
+class MissedWindow:
+    """The look-back window for check_missed_reminders"""
+    start: datetime
+    now: datetime
+    # Calendar days the window touches, first and last included
+    days: int
+
+def _missed_once(window, reminder, hour, minute, last_sent_dt):
+    """Today's slot, if it has already passed"""
+    scheduled_dt = window.now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return [scheduled_dt] if window.start < scheduled_dt < window.now else []
+
+def _missed_on_days(window, hour, minute, weekdays_only):
+    """One slot per calendar day in the window, optionally Monday-Friday only"""
+    first_slot = window.start.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return [
+        scheduled_dt
+        for scheduled_dt in (first_slot + timedelta(days=i) for i in range(window.days))
+        if window.start < scheduled_dt < window.now
+        and (not weekdays_only or scheduled_dt.weekday() <= 4)
+    ]
+
+def _missed_daily(window, reminder, hour, minute, last_sent_dt):
+    """Every day's slot in the window"""
+    return _missed_on_days(window, hour, minute, False)
+
+def _missed_weekdays(window, reminder, hour, minute, last_sent_dt):
+    """Every weekday's slot in the window"""
+    return _missed_on_days(window, hour, minute, True)
+
+def _missed_weekly(window, reminder, hour, minute, last_sent_dt):
+    """The slot a week after the last send, if more than 7 days ago and within window"""
+    if not last_sent_dt or (window.now - last_sent_dt).days < 7 or last_sent_dt <= window.start:
+        return []
+    next_due = (last_sent_dt + timedelta(days=7)).replace(hour=hour, minute=minute)
+    return [next_due] if window.start < next_due < window.now else []
+
+def _missed_monthly(window, reminder, hour, minute, last_sent_dt):
+    """The schedule_day slot of each month in the window not already sent that month"""
+    schedule_day = reminder.schedule_day
+    if not schedule_day or not 1 <= schedule_day <= 31:
+        return []
+    
+    # Every (year, month) the window touches - usually one or two
+    first = window.start.year * 12 + window.start.month - 1
+    last = window.now.year * 12 + window.now.month - 1
+    
+    missed = []
+    for year, month0 in (divmod(index, 12) for index in range(first, last + 1)):
+        month = month0 + 1
+        valid_day = get_valid_day_for_month(year, month, schedule_day)
+        scheduled_dt = datetime(year, month, valid_day, hour, minute)
+        if window.start < scheduled_dt < window.now:
+            # Check if not already sent this month
+            if reminder.last_sent_period != year * 100 + month:
+                missed.append(scheduled_dt)
+    return missed
+
+def _missed_yearly(window, reminder, hour, minute, last_sent_dt):
+    """The yearly date, if it fell in the window and was not sent that year"""
+    schedule_day = reminder.schedule_day
+    schedule_month = reminder.schedule_month
+    if not (schedule_month and schedule_day):
+        return []
+    if not (1 <= schedule_month <= 12 and 1 <= schedule_day <= 31):
+        return []
+    
+    missed = []
+    for year in sorted({window.start.year, window.now.year}):
+        valid_day = get_valid_day_for_month(year, schedule_month, schedule_day)
+        try:
+            scheduled_dt = datetime(year, schedule_month, valid_day, hour, minute)
+        except ValueError:
+            continue  # Invalid date
+        
+        if window.start < scheduled_dt < window.now:
+            # Check if not already sent this year
+            if not reminder.last_sent_period or reminder.last_sent_period // 100 != year:
+                missed.append(scheduled_dt)
+    return missed
+
+_MISSED_HANDLERS = {
+    "Once": _missed_once,
+    "Daily": _missed_daily,
+    "Weekdays": _missed_weekdays,
+    "Weekly": _missed_weekly,
+    "Monthly": _missed_monthly,
+    "Yearly": _missed_yearly,
+}
 
 class SchedulerService:
     """Manages scheduled reminders"""
@@ -25,180 +259,151 @@ class SchedulerService:
         self.log_callback = log_callback  # ✅ FIXED: Store log_callback
         self.is_running = False
         self.scheduler_thread = None
+        # Set to wake the loop early (reminder changed or stop requested)
+        self._wake = threading.Event()
+        # reminder_id -> (last_sent epoch, datetime) so each send is converted once
+        self._last_sent_cache = {}
+        # reminders_version and earliest next_fire_ts seen by the last full check;
+        # while neither has moved a tick is a single integer read
+        self._reminders_version = None
+        self._next_due_ts = None
+        # Epoch seconds the loop started; earlier fire times are the missed check's
+        self._started_ts = None
     
-    def log(self, message):
-        """Log message"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_msg = f"[{timestamp}] {message}"
-        print(log_msg)
-        logger.info(message)
-        if self.log_callback:  # ✅ FIXED: Send to GUI callback
-            self.log_callback(log_msg)
-    
-    def get_valid_day_for_month(self, year, month, desired_day):
+    def log(self, message, level=logging.INFO):
+        """
+        Log message to the file log, and once to log_callback - or to the
+        console when there is no callback (callers that want both print there)
         """
-        Get valid day for a given month/year
-        If desired_day doesn't exist (e.g., Feb 31), return last day of month
+        logger.log(level, message)
         
-        Args:
-            year: Year (e.g., 2024)
-            month: Month (1-12)
-            desired_day: Desired day (1-31)
+        log_msg = f"[{time.strftime(LOG_TIME_FORMAT)}] {message}"
+        if self.log_callback:
+            self.log_callback(log_msg)
+        else:
+            print(log_msg)
+    
+    def last_sent_datetime(self, reminder_id, last_sent):
+        """Local datetime for a last_sent epoch, memoised until the reminder is sent again"""
+        if not last_sent:
+            return None
+        cached = self._last_sent_cache.get(reminder_id)
+        if cached is None or cached[0] != last_sent:
+            cached = (last_sent, datetime.fromtimestamp(last_sent))
+            self._last_sent_cache[reminder_id] = cached
+        return cached[1]
+    
+    # Kept as a method for existing callers
+    get_valid_day_for_month = staticmethod(get_valid_day_for_month)
+    
+    def schedule_pending_reminders(self):
+        """Fill in next_fire_ts for new, re-activated and migrated reminders"""
+        # Look back one grace period so a reminder created at 09:00:30 for
+        # 09:00 still goes out
+        after_ts = time.time() - DUE_GRACE_SECONDS
         
-        Returns:
-            Valid day for that month (1-31)
-        """
-        # Get number of days in the month
-        days_in_month = calendar.monthrange(year, month)[1]
+        rows = []
+        for reminder in self.db.get_unscheduled_reminders():
+            next_fire = compute_next_fire(
+                reminder['frequency'],
+                reminder['schedule_hour'],
+                reminder['schedule_minute'],
+                reminder['schedule_day'],
+                reminder['schedule_month'],
+                after_ts,
+                reminder['last_sent']
+            )
+            if next_fire is None:
+                logger.warning("Reminder %s has an invalid schedule", reminder['id'])
+                continue
+            rows.append((next_fire, reminder['id']))
         
-        # Return the minimum of desired_day and days_in_month
-        return min(desired_day, days_in_month)
+        if rows:
+            self.db.set_next_fire_bulk(rows)
     
     def check_due_reminders(self):
-        """Check and process due reminders"""
-        current_time = datetime.now()
-        current_hour = current_time.hour
-        current_minute = current_time.minute
-        current_day = current_time.weekday()  # 0=Monday, 6=Sunday
-        current_date = current_time.day  # Day of month (1-31)
-        current_month = current_time.month  # Month (1-12)
-        current_year = current_time.year
+        """Send reminders whose next_fire_ts has passed and schedule their next fire"""
+        version = self.db.get_reminders_version()
+        now_ts = time.time()
+        if (version == self._reminders_version and
+                (self._next_due_ts is None or now_ts < self._next_due_ts)):
+            return  # No reminder changed and none is due yet
         
-        # Get all active reminders
-        reminders = self.db.get_active_reminders()
+        self.schedule_pending_reminders()
         
-        for reminder in reminders:
-            reminder_id = reminder['id']
-            contact_name = reminder['contact_name']
-            phone = reminder['phone']
-            message = reminder['message']
-            schedule_time = reminder['schedule_time']
-            frequency = reminder['frequency']
-            last_sent = reminder['last_sent']
-            schedule_day = reminder.get('schedule_day')  # For Monthly/Yearly
-            schedule_month = reminder.get('schedule_month')  # For Yearly
+        rows = []
+        # (last_sent, reminder_id) for every successful send, stored in one commit
+        sent = []
+        
+        started_ts = self._started_ts or now_ts
+        
+        for reminder in self.db.get_due_reminders(int(now_ts)):
+            reminder_id = reminder.id
+            last_sent_ts = reminder.last_sent
+            late = now_ts - reminder.next_fire_ts > DUE_GRACE_SECONDS
             
-            # Parse schedule time
-            try:
-                schedule_hour, schedule_minute = map(int, schedule_time.split(':'))
-            except:
-                logger.error(f"Invalid schedule time format for reminder {reminder_id}: {schedule_time}")
-                continue
+            if late and reminder.next_fire_ts < started_ts:
+                # Fell due while the scheduler was down - check_missed_reminders
+                # covers it, so just move it forward
+                if not (last_sent_ts and last_sent_ts >= reminder.next_fire_ts):
+                    self.log(f"⚠️ Reminder #{reminder_id} for {reminder.contact_name} fell due "
+                             f"while the scheduler was stopped - not sent", logging.WARNING)
+            elif last_sent_ts and now_ts - last_sent_ts < RESEND_GUARD_SECONDS:
+                logger.debug("Reminder %s was sent recently, skipping", reminder_id)
+            else:
+                if late:
+                    # Fell due while an earlier send was still retrying
+                    self.log(f"⚠️ Reminder #{reminder_id} is {int(now_ts - reminder.next_fire_ts) // 60} min late, "
+                             f"sending now", logging.WARNING)
+                success, _, sent_ts = self.process_reminder(
+                    reminder_id,
+                    reminder.contact_name,
+                    reminder.phone,
+                    reminder.message,
+                    reminder.frequency
+                )
+                if success:
+                    sent.append((sent_ts, reminder_id))
+                    last_sent_ts = sent_ts
             
-            # Check if time matches (within 1 minute window)
-            time_matches = (
-                schedule_hour == current_hour and
-                abs(schedule_minute - current_minute) <= 1
+            next_fire = compute_next_fire(
+                reminder.frequency,
+                reminder.schedule_hour,
+                reminder.schedule_minute,
+                reminder.schedule_day,
+                reminder.schedule_month,
+                now_ts,
+                last_sent_ts
             )
-            
-            if not time_matches:
-                continue
-            
-            # Check if already sent recently (within last 5 minutes to avoid duplicates)
-            if last_sent:
-                try:
-                    last_sent_dt = datetime.strptime(last_sent, '%Y-%m-%d %H:%M:%S')
-                    time_since_sent = (current_time - last_sent_dt).total_seconds()
-                    
-                    if time_since_sent < 300:  # 5 minutes
-                        continue
-                except:
-                    pass  # If parsing fails, proceed with check
-            
-            # Check frequency and determine if should send
-            should_send = False
-            
-            if frequency == "Once":
-                # Only send if never sent before
-                if not last_sent:
-                    should_send = True
-            
-            elif frequency == "Daily":
-                # Send every day at the scheduled time
-                should_send = True
-            
-            elif frequency == "Weekdays":
-                # Monday=0 to Friday=4
-                if current_day <= 4:
-                    should_send = True
-            
-            elif frequency == "Weekly":
-                # Check if a week has passed since last sent
-                if not last_sent:
-                    should_send = True
-                else:
-                    try:
-                        last_sent_dt = datetime.strptime(last_sent, '%Y-%m-%d %H:%M:%S')
-                        days_since = (current_time - last_sent_dt).days
-                        if days_since >= 7:
-                            should_send = True
-                    except:
-                        should_send = True  # If error, allow send
-            
-            elif frequency == "Monthly":
-                # Check if current day matches schedule_day
-                if schedule_day is None:
-                    logger.warning(f"Monthly reminder {reminder_id} missing schedule_day")
-                    continue
-                
-                # Get valid day for current month (handles Feb 31 -> Feb 28/29, etc.)
-                valid_day = self.get_valid_day_for_month(current_year, current_month, schedule_day)
-                
-                if current_date == valid_day:
-                    # Check if already sent this month
-                    if not last_sent:
-                        should_send = True
-                    else:
-                        try:
-                            last_sent_dt = datetime.strptime(last_sent, '%Y-%m-%d %H:%M:%S')
-                            # Check if last sent was in a different month or year
-                            if (last_sent_dt.month != current_month or 
-                                last_sent_dt.year != current_year):
-                                should_send = True
-                        except:
-                            should_send = True  # If error, allow send
-            
-            elif frequency == "Yearly":
-                # Check if current month and day match schedule
-                if schedule_month is None or schedule_day is None:
-                    logger.warning(f"Yearly reminder {reminder_id} missing schedule_month or schedule_day")
-                    continue
-                
-                # Check if current month matches
-                if current_month == schedule_month:
-                    # Get valid day for this month/year (handles Feb 29 on non-leap years)
-                    valid_day = self.get_valid_day_for_month(current_year, current_month, schedule_day)
-                    
-                    if current_date == valid_day:
-                        # Check if already sent this year
-                        if not last_sent:
-                            should_send = True
-                        else:
-                            try:
-                                last_sent_dt = datetime.strptime(last_sent, '%Y-%m-%d %H:%M:%S')
-                                # Check if last sent was in a different year
-                                if last_sent_dt.year != current_year:
-                                    should_send = True
-                            except:
-                                should_send = True  # If error, allow send
-            
-            # Send if due
-            if should_send:
-                self.process_reminder(reminder_id, contact_name, phone, message, frequency)
+            rows.append((next_fire, reminder_id))
+        
+        if sent:
+            self.db.update_last_sent_bulk(sent)
+        if rows:
+            self.db.set_next_fire_bulk(rows)
+        
+        # Our own writes above bump the version, so the next tick re-checks once
+        self._reminders_version = version
+        self._next_due_ts = self.db.get_next_due_time()
     
     def process_reminder(self, reminder_id, name, phone, message, frequency):
-        """Process and send a single reminder"""
+        """
+        Send a single reminder; the caller records last_sent
+        
+        Returns:
+            tuple: (success: bool, reminder_id, sent_at epoch seconds)
+        """
         self.log(f"📤 Processing reminder #{reminder_id} for {name} ({frequency})")
         
         # Send message with retry
         success, error = self.whatsapp.send_message_with_retry(phone, message)
         
         if success:
-            # Update last sent time
-            self.db.update_last_sent(reminder_id)
             self.log(f"✅ Reminder sent successfully to {name}")
         else:
             self.log(f"❌ Failed to send reminder to {name}: {error}")
+        
+        return success, reminder_id, int(time.time())
     
     def check_missed_reminders(self):
         """Check and send missed reminders from past window"""
@@ -209,142 +414,47 @@ class SchedulerService:
         
         now = datetime.now()
         window_start = now - timedelta(hours=config.MISSED_REMINDER_WINDOW)
+        window = MissedWindow(window_start, now, (now.date() - window_start.date()).days + 1)
         
-        reminders = self.db.get_active_reminders()
-        missed_count = 0
+        reminders = self.db.get_missed_candidates(window.start, window.now)
+        # (reminder_id, phone, message) for every missed slot
+        pending = []
         
         for reminder in reminders:
-            reminder_id = reminder['id']
-            contact_name = reminder['contact_name']
-            phone = reminder['phone']
-            message = reminder['message']
-            schedule_time = reminder['schedule_time']
-            frequency = reminder['frequency']
-            last_sent = reminder['last_sent']
-            schedule_day = reminder.get('schedule_day')
-            schedule_month = reminder.get('schedule_month')
-            
-            # Parse schedule time
-            try:
-                hour, minute = map(int, schedule_time.split(':'))
-            except:
+            handler = _MISSED_HANDLERS.get(reminder.frequency)
+            if handler is None:
                 continue
             
-            # Check different frequencies
-            should_have_sent = []
-            
-            if frequency == "Once":
-                scheduled_dt = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                if window_start < scheduled_dt < now:
-                    should_have_sent.append(scheduled_dt)
-            
-            elif frequency == "Daily":
-                # Check each day in window
-                check_date = window_start
-                while check_date < now:
-                    scheduled_dt = check_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    if window_start < scheduled_dt < now:
-                        should_have_sent.append(scheduled_dt)
-                    check_date += timedelta(days=1)
+            reminder_id = reminder.id
+            contact_name = reminder.contact_name
+            phone = reminder.phone
+            message = reminder.message
+            last_sent_dt = self.last_sent_datetime(reminder_id, reminder.last_sent)
             
-            elif frequency == "Weekdays":
-                # Check weekdays only
-                check_date = window_start
-                while check_date < now:
-                    if check_date.weekday() <= 4:  # Monday to Friday
-                        scheduled_dt = check_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        if window_start < scheduled_dt < now:
-                            should_have_sent.append(scheduled_dt)
-                    check_date += timedelta(days=1)
-            
-            elif frequency == "Weekly":
-                # Check if weekly reminder was missed
-                if last_sent:
-                    try:
-                        last_sent_dt = datetime.strptime(last_sent, '%Y-%m-%d %H:%M:%S')
-                        # If more than 7 days ago and within window
-                        if (now - last_sent_dt).days >= 7 and last_sent_dt > window_start:
-                            next_due = last_sent_dt + timedelta(days=7)
-                            next_due = next_due.replace(hour=hour, minute=minute)
-                            if window_start < next_due < now:
-                                should_have_sent.append(next_due)
-                    except:
-                        pass
-            
-            elif frequency == "Monthly":
-                if schedule_day:
-                    # Check each month in window
-                    check_date = window_start
-                    while check_date < now:
-                        valid_day = self.get_valid_day_for_month(
-                            check_date.year, check_date.month, schedule_day
-                        )
-                        scheduled_dt = check_date.replace(
-                            day=valid_day, hour=hour, minute=minute, second=0, microsecond=0
-                        )
-                        if window_start < scheduled_dt < now:
-                            # Check if not already sent this month
-                            if last_sent:
-                                last_sent_dt = datetime.strptime(last_sent, '%Y-%m-%d %H:%M:%S')
-                                if (last_sent_dt.month != scheduled_dt.month or 
-                                    last_sent_dt.year != scheduled_dt.year):
-                                    should_have_sent.append(scheduled_dt)
-                            else:
-                                should_have_sent.append(scheduled_dt)
-                        
-                        # Move to next month
-                        if check_date.month == 12:
-                            check_date = check_date.replace(year=check_date.year + 1, month=1)
-                        else:
-                            check_date = check_date.replace(month=check_date.month + 1)
+            hour, minute = reminder.schedule_hour, reminder.schedule_minute
+            if not is_valid_time(hour, minute):
+                continue
             
-            elif frequency == "Yearly":
-                if schedule_month and schedule_day:
-                    # Check if the yearly date was in the window
-                    for year in [window_start.year, now.year]:
-                        if year < window_start.year:
-                            continue
-                        
-                        valid_day = self.get_valid_day_for_month(year, schedule_month, schedule_day)
-                        
-                        try:
-                            scheduled_dt = datetime(
-                                year, schedule_month, valid_day, hour, minute
-                            )
-                            
-                            if window_start < scheduled_dt < now:
-                                # Check if not already sent this year
-                                if last_sent:
-                                    last_sent_dt = datetime.strptime(last_sent, '%Y-%m-%d %H:%M:%S')
-                                    if last_sent_dt.year != year:
-                                        should_have_sent.append(scheduled_dt)
-                                else:
-                                    should_have_sent.append(scheduled_dt)
-                        except ValueError:
-                            pass  # Invalid date
+            should_have_sent = handler(window, reminder, hour, minute, last_sent_dt)
             
             # Check if any scheduled time was missed
             for scheduled_dt in should_have_sent:
-                if last_sent:
-                    try:
-                        last_sent_dt = datetime.strptime(last_sent, '%Y-%m-%d %H:%M:%S')
-                        if last_sent_dt >= scheduled_dt:
-                            continue  # Already sent
-                    except:
-                        pass
+                if last_sent_dt and last_sent_dt >= scheduled_dt:
+                    continue  # Already sent
                 
                 # This is a missed reminder
                 self.log(f"⚠️ Found missed reminder: {contact_name} at {scheduled_dt.strftime('%Y-%m-%d %H:%M')}")
                 
                 # Send with MISSED prefix
-                missed_message = f"⚠️ MISSED REMINDER\n\n{message}"
-                success, error = self.whatsapp.send_message_with_retry(phone, missed_message)
-                
-                if success:
-                    self.db.update_last_sent(reminder_id)
-                    missed_count += 1
-                
-                time.sleep(5)  # Wait between missed reminders
+                pending.append((reminder_id, phone, f"⚠️ MISSED REMINDER\n\n{message}"))
+        
+        # One browser session for the lot, paced by send_batch
+        results = self.whatsapp.send_batch([(phone, text) for _, phone, text in pending])
+        sent_at = int(time.time())
+        sent = [(sent_at, item[0]) for item, (success, _) in zip(pending, results) if success]
+        if sent:
+            self.db.update_last_sent_bulk(sent)
+        missed_count = len(sent)
         
         if missed_count > 0:
             self.log(f"✅ Sent {missed_count} missed reminder(s)")
@@ -354,6 +464,7 @@ class SchedulerService:
     def run_scheduler_loop(self):
         """Main scheduler loop"""
         self.is_running = True
+        self._started_ts = time.time()
         self.log("🚀 Scheduler service started")
         
         # Check for missed reminders on startup
@@ -363,43 +474,88 @@ class SchedulerService:
             except Exception as e:
                 self.log(f"Error checking missed reminders: {e}")
         
-        # Main loop
-        last_check = time.time()
-        
+        # Main loop - sleep until the next scheduled time or until notify()
         while self.is_running:
             try:
-                # Check if it's time to check reminders
-                if time.time() - last_check >= config.CHECK_INTERVAL:
-                    self.check_due_reminders()
-                    last_check = time.time()
-                
-                # Sleep to reduce CPU usage
-                time.sleep(5)
-                
+                self.check_due_reminders()
+                timeout = self.seconds_until_next_check()
             except Exception as e:
                 self.log(f"Error in scheduler loop: {str(e)}")
                 logger.exception("Scheduler loop error")
-                time.sleep(10)
+                timeout = 10
+            
+            self._wake.wait(timeout=timeout)
+            self._wake.clear()
         
         self.log("ℹ️ Scheduler service stopped")
     
+    def seconds_until_next_check(self):
+        """
+        Seconds to sleep before the next due check
+        Fire times fall on whole minutes, so this wakes just after the next
+        minute boundary (or after CHECK_INTERVAL, if shorter)
+        """
+        now = time.time()
+        if self._next_due_ts is not None and self._next_due_ts <= now:
+            return 0
+        return min(60 - now % 60, config.CHECK_INTERVAL) + MINUTE_ALIGN_OFFSET
+    
+    def notify(self):
+        """Wake the scheduler loop so it re-reads reminders immediately"""
+        self._wake.set()
+    
     def start(self):
-        """Start scheduler in background thread"""
-        if not self.is_running:
-            self.scheduler_thread = threading.Thread(
-                target=self.run_scheduler_loop,
-                daemon=True
-            )
-            self.scheduler_thread.start()
-            self.log("Scheduler thread started")
+        """
+        Start scheduler in background thread
+        
+        Returns:
+            bool: False if a previous loop is still finishing (see stop())
+        """
+        if self.scheduler_thread is not None and self.scheduler_thread.is_alive():
+            if self.is_running:
+                return True
+            # Stopped, but still inside a send - a second loop would run alongside it
+            self.log("⚠️ Previous scheduler loop is still finishing - not starting another", logging.WARNING)
+            return False
+        
+        self.scheduler_thread = threading.Thread(
+            target=self.run_scheduler_loop,
+            daemon=True
+        )
+        self.scheduler_thread.start()
+        self.log("Scheduler thread started")
+        return True
     
     def stop(self):
-        """Stop scheduler"""
+        """
+        Stop scheduler, waiting up to 10 seconds for the loop to exit
+        Blocks - call it off the Tk thread
+        
+        Returns:
+            bool: True if the loop thread has exited
+        """
         self.is_running = False
+        self._wake.set()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=10)
+            if self.scheduler_thread.is_alive():
+                self.log("⚠️ Scheduler is still finishing a send; it stops after that", logging.WARNING)
+                return False
         
         self.log("Scheduler stopped")
+        return True
+    
+    def reset(self):
+        """
+        Stop the scheduler and clear its state so start() begins afresh
+        
+        Returns:
+            bool: True if the loop thread has exited
+        """
+        if not self.stop():
+            return False
+        self.scheduler_thread = None
+        return True
     
     def get_status(self):
         """Get scheduler status"""
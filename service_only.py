@@ -14,14 +14,20 @@ sys.path.insert(0, str(Path(__file__).parent))
 import config
 from database import DatabaseManager
 from scheduler_service import SchedulerService
+from whatsapp_service import BrowserPool, WhatsAppService
 
 class ServiceOnly:
     """Headless scheduler service"""
     
     def __init__(self):
         self.running = True
+        # One DatabaseManager (WAL, shared writer + reader pool) for the scheduler thread
         self.db = DatabaseManager()
-        self.scheduler = SchedulerService(self.db, self.log_message)
+        if config.POOL_SIZE > 1:
+            self.whatsapp = BrowserPool(config.POOL_SIZE, self.log_message)
+        else:
+            self.whatsapp = WhatsAppService(self.log_message)
+        self.scheduler = SchedulerService(self.db, self.whatsapp, self.log_message)
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -77,10 +83,15 @@ class ServiceOnly:
         # Start scheduler
         self.scheduler.start()
         
-        # Keep running
+        # Keep running, checking pooled browsers every POOL_HEALTH_INTERVAL
+        pooled = isinstance(self.whatsapp, BrowserPool)
+        last_health_check = time.monotonic()
         try:
             while self.running:
                 time.sleep(1)
+                if pooled and time.monotonic() - last_health_check >= config.POOL_HEALTH_INTERVAL:
+                    self.whatsapp.check_health()
+                    last_health_check = time.monotonic()
         except KeyboardInterrupt:
             pass
         
@@ -91,6 +102,7 @@ class ServiceOnly:
 
 def main():
     """Main entry point"""
+    config.setup_logging()
     service = ServiceOnly()
     service.run()
 
@@ -8,30 +8,437 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import atexit
+import json
+import os
+import queue
+import random
+import socket
+import sys
+import threading
 import time
 import urllib.parse
+import urllib.request
+import weakref
 import config
 
+# ChromeDriver path resolved once per process (see _resolve_driver)
+_DRIVER_PATH = None
+_DRIVER_LOCK = threading.Lock()
+
+def _installed_chrome_version(manager):
+    """Chrome version reported by the OS, or None if it can't be detected"""
+    try:
+        return manager.driver.get_browser_version_from_os()
+    except Exception:
+        return None
+
+def _resolve_driver():
+    """
+    Get the ChromeDriver path, installing it only when needed
+    The path is cached in memory and in DRIVER_CACHE_FILE, keyed by the
+    installed Chrome version, so webdriver-manager only runs after a Chrome update
+    """
+    global _DRIVER_PATH
+    
+    with _DRIVER_LOCK:
+        if _DRIVER_PATH and os.path.isfile(_DRIVER_PATH):
+            return _DRIVER_PATH
+        
+        manager = ChromeDriverManager()
+        chrome_version = _installed_chrome_version(manager)
+        
+        try:
+            cached = json.loads(config.DRIVER_CACHE_FILE.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            cached = {}
+        
+        path = cached.get('driver_path')
+        if not (chrome_version and cached.get('chrome_version') == chrome_version
+                and path and os.path.isfile(path)):
+            path = manager.install()
+            try:
+                config.DRIVER_CACHE_FILE.write_text(
+                    json.dumps({'driver_path': path, 'chrome_version': chrome_version}),
+                    encoding='utf-8'
+                )
+            except OSError:
+                pass  # Cache is an optimisation only
+        
+        _DRIVER_PATH = path
+        return path
+
+# Media never needed to send text; blocked in headless mode only so the
+# setup window still looks right
+HEADLESS_BLOCKED_URLS = ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.mp4", "*.woff", "*.woff2"]
+
+# Separators people type inside phone numbers, and the leading + (the /send
+# URL wants digits only; a raw + in a query string reads as a space)
+_PHONE_TRANS = str.maketrans('', '', ' -()+\t\r\n')
+
+@lru_cache(maxsize=4096)
+def _clean_phone(phone):
+    """Phone number as used in the /send URL (digits only)"""
+    return phone.translate(_PHONE_TRANS)
+
+class TokenBucket:
+    """Thread-safe blocking token bucket: rate tokens per second, burst saved up"""
+    
+    def __init__(self, rate, burst=1):
+        """Initialize bucket (full)"""
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Going below zero reserves the next token for this caller
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        
+        if wait > 0:
+            time.sleep(wait)
+
+def _close_idle_service(service_ref):
+    """BROWSER_TIMEOUT timer callback; holds the service weakly so it can still be collected"""
+    service = service_ref()
+    if service is not None:
+        service.check_browser_timeout()
+
+# Lines queued by WhatsAppService.log as (timestamp, callback, message),
+# written by one background thread so sends never wait on stdout or the GUI
+_LOG_QUEUE = queue.Queue()
+_LOG_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_LOG_THREAD = None
+_LOG_THREAD_LOCK = threading.Lock()
+
+# Put on the log queue at exit to stop the writer; how long exit waits for it
+_LOG_STOP = None
+_LOG_EXIT_TIMEOUT = 2
+
+def _log_writer():
+    """Drain the log queue: one stdout write and one call per callback per batch"""
+    stamp_second, stamp = None, ''
+    
+    while True:
+        batch = [_LOG_QUEUE.get()]
+        try:
+            while True:
+                batch.append(_LOG_QUEUE.get_nowait())
+        except queue.Empty:
+            pass
+        
+        stopping = _LOG_STOP in batch
+        lines = []
+        callback_lines = {}
+        for item in batch:
+            if item is _LOG_STOP:
+                continue
+            ts, callback, message = item
+            # strftime only when the second changes
+            second = int(ts)
+            if second != stamp_second:
+                stamp_second, stamp = second, time.strftime(_LOG_TIME_FORMAT, time.localtime(second))
+            line = f"[{stamp}] {message}"
+            lines.append(line)
+            if callback:
+                callback_lines.setdefault(callback, []).append(line)
+        
+        if lines:
+            try:
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
+            except (AttributeError, OSError, ValueError):
+                pass  # No usable console (pythonw, closed pipe)
+        
+        for callback, cb_lines in callback_lines.items():
+            try:
+                callback("\n".join(cb_lines))
+            except Exception:
+                pass
+        
+        if stopping:
+            return
+
+def _stop_log_writer():
+    """Exit handler: flush queued lines, but never wait on the writer for long"""
+    _LOG_QUEUE.put(_LOG_STOP)
+    _LOG_THREAD.join(timeout=_LOG_EXIT_TIMEOUT)
+
+def _start_log_writer():
+    """Start the log writer thread on first use; queued lines are flushed at exit"""
+    global _LOG_THREAD
+    
+    if _LOG_THREAD is not None:
+        return
+    
+    with _LOG_THREAD_LOCK:
+        if _LOG_THREAD is None:
+            _LOG_THREAD = threading.Thread(target=_log_writer, name="whatsapp-log", daemon=True)
+            _LOG_THREAD.start()
+            atexit.register(_stop_log_writer)
+
+def _quit_driver(driver_box):
+    """
+    Finalizer for WhatsAppService: quit whatever driver is still open
+    Takes the service's driver box, not the service, so it holds no reference back
+    """
+    driver, driver_box[0] = driver_box[0], None
+    if driver is not None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+# Marker in each browser profile recording when a send last succeeded
+SESSION_FILE_NAME = ".wa_session"
+
+# How often the marker is rewritten while sends keep succeeding (seconds)
+SESSION_SAVE_INTERVAL = 3600
+
+# send_message's error when WhatsApp Web didn't respond (slow, rate limited or logged out)
+TIMEOUT_ERROR = "Timeout waiting for WhatsApp interface"
+
+# Chat search box - present once WhatsApp Web has a logged-in session
+SEL_SEARCH = (By.CSS_SELECTOR, 'div[contenteditable="true"][data-tab="3"]')
+
+def _debugger_listening(port):
+    """True if something accepts connections on the local debugging port"""
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+# Talks to the local DevTools endpoint directly, never through a configured proxy
+_LOCAL_OPENER = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+def _probe_debugger(port, profile_dir):
+    """
+    Identify what is listening on the local debugging port
+    Chrome writes its port and browser websocket path to DevToolsActivePort in
+    the profile it runs on; /json/version must report the same websocket
+    
+    Returns:
+        None if nothing is listening, True if it is Chrome running on
+        profile_dir, False if it is anything else
+    """
+    if not _debugger_listening(port):
+        return None
+    
+    try:
+        with _LOCAL_OPENER.open(f"http://127.0.0.1:{port}/json/version", timeout=1) as response:
+            info = json.loads(response.read().decode('utf-8'))
+        with open(os.path.join(profile_dir, "DevToolsActivePort"), encoding='utf-8') as f:
+            active_port = f.read().split()
+    except (OSError, ValueError):
+        return False
+    
+    return (
+        len(active_port) >= 2
+        and active_port[0] == str(port)
+        and 'Chrome' in info.get('Browser', '')
+        and info.get('webSocketDebuggerUrl', '').endswith(active_port[1])
+    )
+
+# The open chat's message box (CSS is matched natively, no XPath document walk)
+MSG_BOX_SELECTOR = 'div[contenteditable="true"][data-tab="10"]'
+SEL_MSGBOX = (By.CSS_SELECTOR, MSG_BOX_SELECTOR)
+
+# The conversation panel and the contact name in its header. Together they
+# identify the open chat, so a repeat send can tell if the user (or anything
+# else driving the browser) switched to another conversation
+CHAT_PANEL_SELECTOR = '#main'
+CHAT_TITLE_SELECTOR = '#main header span[dir="auto"]'
+
+# Outgoing message rows, and the tick icons WhatsApp shows once the server
+# has accepted one (a clock icon means still pending)
+OUTGOING_MESSAGE_SELECTOR = 'div.message-out'
+SENT_ICON_SELECTOR = 'span[data-icon="msg-check"], span[data-icon="msg-dblcheck"], span[data-icon="msg-dblcheck-ack"]'
+
+# window.__waSend page helper, registered for every new document at browser
+# start so each send step is one Runtime.evaluate. Waits use a
+# MutationObserver rather than WebDriverWait's polling. prepare() returns
+# PREPARE_NO_BOX / PREPARE_NO_DRAFT on timeout, and PREPARE_NO_BOX when asked
+# to reuse a chat that is no longer the one opened for that phone
+PREPARE_NO_BOX = -1
+PREPARE_NO_DRAFT = -2
+SEND_HELPER_JS = """
+window.__waSend = window.__waSend || (() => {
+    const BOX = %s, OUTGOING = %s, SENT_ICON = %s, PANEL = %s, TITLE = %s;
+    const box = () => document.querySelector(BOX);
+    const chat = () => ({
+        panel: document.querySelector(PANEL),
+        title: document.querySelector(TITLE)?.textContent ?? '',
+    });
+    // The chat the last /send navigation opened, as {phone, panel, title}
+    let openChat = null;
+    const isOpen = phone => {
+        if (openChat === null || openChat.phone !== phone) return false;
+        const current = chat();
+        return current.panel === openChat.panel && current.title === openChat.title;
+    };
+    const waitFor = (check, timeoutMs) => new Promise(resolve => {
+        if (check()) return resolve(true);
+        if (timeoutMs <= 0) return resolve(false);
+        const observer = new MutationObserver(() => {
+            if (check()) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(true);
+            }
+        });
+        const timer = setTimeout(() => { observer.disconnect(); resolve(false); }, timeoutMs);
+        observer.observe(document.documentElement, {
+            childList: true, subtree: true, characterData: true,
+            attributes: true, attributeFilter: ['data-icon'],
+        });
+    });
+    return {
+        // Wait for the message box (and the text prefilled from the /send
+        // URL if draftMs > 0), focus it, return the outgoing message count.
+        // reuse: only type into the open chat if it is still phone's;
+        // otherwise remember this chat as phone's for later reuse
+        async prepare(boxMs, draftMs, phone, reuse) {
+            if (reuse && !isOpen(phone)) return %d;
+            if (!await waitFor(() => box() !== null, boxMs)) return %d;
+            if (draftMs > 0 && !await waitFor(() => (box()?.textContent ?? '').trim().length > 0, draftMs)) return %d;
+            const el = box();
+            if (!el) return %d;
+            if (!reuse) {
+                const current = chat();
+                openChat = current.panel && current.title ? {phone, ...current} : null;
+            }
+            el.focus();
+            return document.querySelectorAll(OUTGOING).length;
+        },
+        // True once a message past the first `before` shows a tick
+        waitSent(before, timeoutMs) {
+            return waitFor(() => {
+                const rows = document.querySelectorAll(OUTGOING);
+                return rows.length > before && rows[rows.length - 1].querySelector(SENT_ICON) !== null;
+            }, timeoutMs);
+        },
+    };
+})();
+true
+""" % (
+    json.dumps(MSG_BOX_SELECTOR), json.dumps(OUTGOING_MESSAGE_SELECTOR), json.dumps(SENT_ICON_SELECTOR),
+    json.dumps(CHAT_PANEL_SELECTOR), json.dumps(CHAT_TITLE_SELECTOR),
+    PREPARE_NO_BOX, PREPARE_NO_BOX, PREPARE_NO_DRAFT, PREPARE_NO_BOX,
+)
+
+# Longest wait for the tick after pressing Enter (seconds)
+SEND_CONFIRM_TIMEOUT = 10
+
+# Longest wait for a chat's message box after opening it (seconds)
+MESSAGE_BOX_TIMEOUT = 20
+
+# CDP key events for Enter (trusted, unlike a synthetic KeyboardEvent)
+ENTER_KEY_EVENT = {"key": "Enter", "code": "Enter", "windowsVirtualKeyCode": 13, "nativeVirtualKeyCode": 13}
+
 class WhatsAppService:
     """Handles WhatsApp Web automation"""
     
-    def __init__(self, log_callback=None):
-        """Initialize WhatsApp service"""
-        self.driver = None
+    def __init__(self, log_callback=None, slot=0, rate_limiter=None):
+        """
+        Initialize WhatsApp service
+        
+        Args:
+            log_callback: Called with each formatted log line
+            slot: Browser pool slot, selects the profile and debugging port
+            rate_limiter: TokenBucket to share with other services on the same number
+        """
+        # The driver lives in a one-item list the finalizer can see without self
+        self._driver_box = [None]
+        self._finalizer = weakref.finalize(self, _quit_driver, self._driver_box)
+        self.slot = slot
+        self.profile_dir, self.debug_port = config.browser_slot_paths(slot)
+        self._session_file = os.path.join(self.profile_dir, SESSION_FILE_NAME)
+        self._session_saved = 0
         self.log_callback = log_callback
         self.is_logged_in = False
         self.last_activity = time.time()
+        # Idle timing uses the monotonic clock so clock changes can't close early
+        self._last_activity_mono = time.monotonic()
+        self._timeout_timer = None
+        # Held for a whole send, batch or close - the GUI's worker threads, the
+        # scheduler thread and the idle timer all share this one driver
+        self._send_lock = threading.RLock()
+        # Phone whose chat is currently open, so repeat sends skip navigation
+        self.current_phone = None
+        # WebDriverWaits for the current driver, made once in init_browser
+        self._wait_msg = None
+        self._wait_login = None
+        # Shared by every send path, including retries
+        self._rate = rate_limiter or TokenBucket(config.SEND_RATE_PER_SECOND, config.SEND_BURST)
+        # Static parts of every /send URL's text, quoted once
+        self._prefix_q = urllib.parse.quote(config.MESSAGE_PREFIX, safe='')
+        self._suffix_q = urllib.parse.quote(config.MESSAGE_SUFFIX, safe='')
+    
+    @property
+    def driver(self):
+        """The WebDriver, or None when no browser is open"""
+        return self._driver_box[0]
+    
+    @driver.setter
+    def driver(self, value):
+        """Set the WebDriver"""
+        self._driver_box[0] = value
+    
+    def __enter__(self):
+        """Use as a context manager; the browser closes on exit"""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the browser"""
+        self.close_browser()
+    
+    def _load_session(self):
+        """True if the profile recorded a successful send within SESSION_TTL"""
+        try:
+            with open(self._session_file, encoding='utf-8') as f:
+                last_login_ts = json.load(f)['last_login_ts']
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return time.time() - last_login_ts < config.SESSION_TTL
+    
+    def _save_session(self):
+        """Record a successful send in the profile (at most once per SESSION_SAVE_INTERVAL)"""
+        now = time.time()
+        if now - self._session_saved < SESSION_SAVE_INTERVAL:
+            return
+        
+        try:
+            with open(self._session_file, 'w', encoding='utf-8') as f:
+                json.dump({'last_login_ts': now}, f)
+            self._session_saved = now
+        except OSError:
+            pass  # Only saves a login check next start
+    
+    def _clear_session(self):
+        """Forget the recorded session after WhatsApp stopped responding like a logged-in page"""
+        self._session_saved = 0
+        try:
+            os.remove(self._session_file)
+        except OSError:
+            pass
     
     def log(self, message):
-        """Log message"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        log_msg = f"[{timestamp}] {message}"
-        print(log_msg)
-        if self.log_callback:
-            self.log_callback(log_msg)
+        """Log message (timestamped and written by the background log writer)"""
+        _start_log_writer()
+        _LOG_QUEUE.put_nowait((time.time(), self.log_callback, message))
     
     def init_browser(self):
         """Initialize browser with optimized settings"""
@@ -41,12 +448,42 @@ class WhatsAppService:
         try:
             self.log("Initializing headless browser...")
             
-            # Get browser options from config
-            options = config.get_browser_options()
+            service = Service(_resolve_driver())
+            
+            # Reuse a Chrome that is already running with our profile
+            owner = _probe_debugger(self.debug_port, self.profile_dir)
+            if owner:
+                self.driver = self._attach_browser(service)
+                if self.driver is None:
+                    # It still holds the profile lock, so a new Chrome can't use it
+                    self.log("❌ Chrome is already running on this profile but could not be attached to - close it and try again")
+                    return False
+            elif owner is False:
+                self.log(f"❌ Debugging port {self.debug_port} is used by another program - "
+                         f"close it or change BROWSER_DEBUG_PORT")
+                return False
+            
+            if self.driver is None:
+                # Get browser options from config
+                options = config.get_browser_options(self.slot)
+                
+                # Initialize Chrome with automatic driver management
+                self.driver = webdriver.Chrome(service=service, options=options)
+            
+            self._wait_msg = WebDriverWait(self.driver, MESSAGE_BOX_TIMEOUT, poll_frequency=0.1)
+            self._wait_login = WebDriverWait(self.driver, config.WHATSAPP_LOAD_TIME, poll_frequency=0.25)
+            
+            # Recently used profile - assume still logged in; a logged-out
+            # page shows up as a timeout in send_message, which logs in again
+            if not self.is_logged_in and self._load_session():
+                self.is_logged_in = True
+            
+            if config.HEADLESS_BROWSER and hasattr(self.driver, 'execute_cdp_cmd'):
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": HEADLESS_BLOCKED_URLS})
             
-            # Initialize Chrome with automatic driver management
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
+            if hasattr(self.driver, 'execute_cdp_cmd'):
+                self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": SEND_HELPER_JS})
             
             self.log("Browser initialized successfully")
             return True
@@ -55,25 +492,85 @@ class WhatsAppService:
             self.log(f"Error initializing browser: {str(e)}")
             return False
     
+    def _attach_browser(self, service):
+        """
+        Attach to the Chrome listening on this slot's debugging port
+        
+        Returns:
+            The driver, or None if attaching failed
+        """
+        options = webdriver.ChromeOptions()
+        options.add_experimental_option("debuggerAddress", f"127.0.0.1:{self.debug_port}")
+        
+        try:
+            driver = webdriver.Chrome(service=service, options=options)
+        except WebDriverException as e:
+            self.log(f"Could not attach to running browser: {e.msg}")
+            return None
+        
+        # The profile keeps the session - if the chat list is already there,
+        # skip the login wait entirely
+        if driver.current_url.startswith(config.WHATSAPP_WEB_URL) and driver.find_elements(*SEL_SEARCH):
+            self.is_logged_in = True
+        
+        self.log("Attached to running browser")
+        return driver
+    
+    def _touch(self):
+        """Record activity and re-arm the idle timer that closes the browser"""
+        self.last_activity = time.time()
+        self._last_activity_mono = time.monotonic()
+        
+        if not config.KEEP_BROWSER_ALIVE:
+            return
+        
+        if self._timeout_timer is not None:
+            self._timeout_timer.cancel()
+        self._timeout_timer = threading.Timer(config.BROWSER_TIMEOUT, _close_idle_service, (weakref.ref(self),))
+        self._timeout_timer.daemon = True
+        self._timeout_timer.start()
+    
     def close_browser(self):
-        """Close browser and free resources"""
-        if self.driver:
-            try:
-                self.driver.quit()
-                self.driver = None
-                self.is_logged_in = False
-                self.log("Browser closed")
-            except Exception as e:
-                self.log(f"Error closing browser: {str(e)}")
+        """Close browser and free resources (waits for a send in progress)"""
+        with self._send_lock:
+            if self._timeout_timer is not None:
+                self._timeout_timer.cancel()
+                self._timeout_timer = None
+            
+            if self.driver:
+                try:
+                    self.driver.quit()
+                    self.driver = None
+                    self.is_logged_in = False
+                    self.current_phone = None
+                    self.log("Browser closed")
+                except Exception as e:
+                    self.log(f"Error closing browser: {str(e)}")
+    
+    def reset(self):
+        """Close the browser and clear login state, keeping this instance"""
+        with self._send_lock:
+            self.close_browser()
+            self.driver = None
+            self.is_logged_in = False
+            self.current_phone = None
+            self.last_activity = time.time()
+            self._last_activity_mono = time.monotonic()
     
     def check_browser_timeout(self):
-        """Close browser if inactive for too long"""
+        """
+        Close browser if inactive for too long
+        Runs from the idle timer armed on each send; safe to call directly too
+        """
         if not config.KEEP_BROWSER_ALIVE:
             return
         
-        if self.driver and (time.time() - self.last_activity) > config.BROWSER_TIMEOUT:
-            self.log("Browser timeout - closing to free resources")
-            self.close_browser()
+        # Checked under the lock so a send that was running when the timer
+        # fired counts as activity
+        with self._send_lock:
+            if self.driver and (time.monotonic() - self._last_activity_mono) >= config.BROWSER_TIMEOUT:
+                self.log("Browser timeout - closing to free resources")
+                self.close_browser()
     
     def login_to_whatsapp(self):
         """Open WhatsApp Web and wait for login"""
@@ -89,14 +586,15 @@ class WhatsAppService:
             self.log("If you see a QR code, scan it with your phone")
             
             # Wait for chat interface (indicates logged in)
-            wait = WebDriverWait(self.driver, config.WHATSAPP_LOAD_TIME)
+            wait = self._wait_login
             
             try:
                 # Look for the search box which appears when logged in
                 wait.until(
-                    EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]'))
+                    EC.presence_of_element_located(SEL_SEARCH)
                 )
                 self.is_logged_in = True
+                self._save_session()
                 self.log("✅ Logged in to WhatsApp Web successfully!")
                 return True
             except TimeoutException:
@@ -108,6 +606,80 @@ class WhatsAppService:
             self.log(f"Error logging in: {str(e)}")
             return False
     
+    def _evaluate(self, expression, await_promise=False):
+        """
+        Evaluate JavaScript in the page over CDP
+        
+        Returns:
+            The value, or None if CDP is unavailable or the evaluation failed
+        """
+        if not hasattr(self.driver, 'execute_cdp_cmd'):
+            return None
+        
+        try:
+            result = self.driver.execute_cdp_cmd("Runtime.evaluate", {
+                "expression": expression,
+                "awaitPromise": await_promise,
+                "returnByValue": True,
+            })
+        except WebDriverException:
+            return None  # e.g. the page navigated mid-wait
+        return result.get('result', {}).get('value')
+    
+    def _call_helper(self, call):
+        """
+        Run a window.__waSend call, installing the helper first if the page
+        was loaded before it was registered (e.g. an attached browser)
+        
+        Returns:
+            The value, or None if CDP is unavailable
+        """
+        value = self._evaluate(call, await_promise=True)
+        if value is None and self._evaluate(SEND_HELPER_JS):
+            value = self._evaluate(call, await_promise=True)
+        return value
+    
+    def _confirm_sent(self, outgoing_before, phone):
+        """
+        Wait for the message just sent to get its tick
+        Without CDP (outgoing_before is None) falls back to a fixed pause
+        """
+        if outgoing_before is None:
+            time.sleep(2)
+            return
+        
+        sent = self._call_helper(f"window.__waSend.waitSent({outgoing_before}, {SEND_CONFIRM_TIMEOUT * 1000})")
+        if not sent:
+            # Still queued in WhatsApp's outbox; it goes out while the browser stays open
+            self.log(f"⚠️ No delivery tick yet for message to {phone}")
+    
+    def _send_via_cdp(self, phone_clean, text):
+        """
+        Type and send text in the chat that is already open, without navigating
+        
+        Returns:
+            int or None: Outgoing message count before sending, or None if CDP
+            is unavailable, no message box was found or the open chat is no
+            longer phone_clean's
+        """
+        # Chromium-only; multi-line text goes through the URL so newlines
+        # don't turn into early Enter presses
+        if '\n' in text:
+            return None
+        
+        outgoing_before = self._call_helper(f"window.__waSend.prepare(0, 0, {json.dumps(phone_clean)}, true)")
+        if outgoing_before is None or outgoing_before < 0:
+            return None
+        
+        self.driver.execute_cdp_cmd("Input.insertText", {"text": text})
+        self._dispatch_enter()
+        return outgoing_before
+    
+    def _dispatch_enter(self):
+        """Press Enter in the focused element over CDP (one command per key event)"""
+        for event_type in ("keyDown", "keyUp"):
+            self.driver.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": event_type, **ENTER_KEY_EVENT})
+    
     def send_message(self, phone, message):
         """
         Send WhatsApp message to phone number
@@ -119,8 +691,13 @@ class WhatsAppService:
         Returns:
             tuple: (success: bool, error_message: str or None)
         """
-        # Update last activity
-        self.last_activity = time.time()
+        with self._send_lock:
+            return self._send_message(phone, message)
+    
+    def _send_message(self, phone, message):
+        """send_message body; the caller holds _send_lock"""
+        # Update last activity (re-arms the idle close)
+        self._touch()
         
         # Initialize browser if needed
         if not self.driver:
@@ -135,13 +712,28 @@ class WhatsAppService:
         
         try:
             # Remove spaces and format phone
-            phone_clean = phone.replace(' ', '').replace('-', '')
+            phone_clean = _clean_phone(phone)
+            
+            self._rate.acquire()
             
             # Add prefix/suffix to message if configured
             full_message = f"{config.MESSAGE_PREFIX}{message}{config.MESSAGE_SUFFIX}"
             
-            # URL encode the message
-            encoded_message = urllib.parse.quote(full_message)
+            # Same chat as the last send and still open - type straight into it
+            if phone_clean == self.current_phone and self.is_logged_in:
+                outgoing_before = self._send_via_cdp(phone_clean, full_message)
+                if outgoing_before is not None:
+                    self._confirm_sent(outgoing_before, phone)
+                    self._save_session()
+                    self.log(f"✅ Message sent successfully to {phone}")
+                    return True, None
+            
+            # URL encode the message (only the variable part is quoted here)
+            encoded_message = (
+                self._prefix_q
+                + urllib.parse.quote_from_bytes(message.encode('utf-8'), safe=b'')
+                + self._suffix_q
+            )
             
             # Construct WhatsApp Web URL
             url = f"{config.WHATSAPP_WEB_URL}/send?phone={phone_clean}&text={encoded_message}"
@@ -149,32 +741,44 @@ class WhatsAppService:
             self.log(f"Sending message to {phone}...")
             self.driver.get(url)
             
-            # Wait for message box to appear
-            wait = WebDriverWait(self.driver, 20)
-            message_box = wait.until(
-                EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="10"]'))
+            # Wait for the message box and its prefilled text, focus it, then
+            # press Enter - one helper call plus the key events over CDP
+            outgoing_before = self._call_helper(
+                f"window.__waSend.prepare({MESSAGE_BOX_TIMEOUT * 1000}, {config.MESSAGE_SEND_DELAY * 1000}, "
+                f"{json.dumps(phone_clean)}, false)"
             )
+            if outgoing_before == PREPARE_NO_BOX:
+                raise TimeoutException("Message box did not appear")
+            if outgoing_before == PREPARE_NO_DRAFT:
+                raise TimeoutException("Message text did not load")
             
-            # Small delay to ensure page is fully loaded
-            time.sleep(config.MESSAGE_SEND_DELAY)
-            
-            # Send the message by pressing Enter
-            message_box.send_keys(Keys.ENTER)
+            if outgoing_before is not None:
+                self._dispatch_enter()
+            else:
+                # No CDP - WebDriver wait, fixed delay for the text, key actions
+                message_box = self._wait_msg.until(EC.presence_of_element_located(SEL_MSGBOX))
+                time.sleep(config.MESSAGE_SEND_DELAY)
+                message_box.send_keys(Keys.ENTER)
+            self.current_phone = phone_clean
             
-            # Wait a moment to ensure message is sent
-            time.sleep(2)
+            # Wait until the message is actually sent
+            self._confirm_sent(outgoing_before, phone)
+            self._save_session()
             
             self.log(f"✅ Message sent successfully to {phone}")
             return True, None
             
         except TimeoutException:
-            error_msg = "Timeout waiting for WhatsApp interface"
+            error_msg = TIMEOUT_ERROR
             self.log(f"❌ {error_msg}")
             self.is_logged_in = False  # Might need to re-login
+            self._clear_session()
+            self.current_phone = None
             return False, error_msg
             
         except Exception as e:
             error_msg = str(e)
+            self.current_phone = None
             self.log(f"❌ Error sending message: {error_msg}")
             return False, error_msg
     
@@ -193,6 +797,7 @@ class WhatsAppService:
         if max_retries is None:
             max_retries = config.MAX_SEND_RETRIES
         
+        delay = config.RETRY_DELAY
         for attempt in range(max_retries):
             success, error = self.send_message(phone, message)
             
@@ -200,13 +805,52 @@ class WhatsAppService:
                 return True, None
             
             if attempt < max_retries - 1:
-                self.log(f"Retry {attempt + 1}/{max_retries} in {config.RETRY_DELAY} seconds...")
-                time.sleep(config.RETRY_DELAY)
+                wait = min(delay + random.uniform(0, config.RETRY_JITTER), config.MAX_RETRY_DELAY)
+                self.log(f"Retry {attempt + 1}/{max_retries} in {wait:.0f} seconds...")
+                time.sleep(wait)
+                # WhatsApp not responding backs off exponentially; other
+                # errors (driver/network hiccups) keep the short delay
+                if error == TIMEOUT_ERROR:
+                    delay *= 2
             else:
                 self.log(f"Failed after {max_retries} attempts")
         
         return False, error
     
+    def send_batch(self, messages):
+        """
+        Send several messages over one browser session
+        Messages to the same phone are sent together so its chat stays open
+        (see _send_via_cdp); pacing comes from the shared rate limiter
+        
+        Args:
+            messages: List of (phone, message) tuples
+            
+        Returns:
+            list: (success: bool, error_message: str or None) per message, in input order
+        """
+        if not messages:
+            return []
+        
+        # One lock for the whole batch so another thread can't open a
+        # different chat between two messages to the same phone
+        with self._send_lock:
+            # Open the browser and log in once for the whole batch
+            if not self.driver and not self.init_browser():
+                return [(False, "Failed to initialize browser")] * len(messages)
+            if not self.is_logged_in and not self.login_to_whatsapp():
+                return [(False, "Not logged in to WhatsApp Web")] * len(messages)
+            
+            # Stable sort keeps each phone's messages in their original order
+            order = sorted(range(len(messages)), key=lambda i: _clean_phone(messages[i][0]))
+            results = [None] * len(messages)
+            
+            for i in order:
+                phone, message = messages[i]
+                results[i] = self.send_message_with_retry(phone, message)
+            
+            return results
+    
     def test_connection(self, phone, message="Test message from WhatsApp Reminder Manager"):
         """Test WhatsApp connection"""
         self.log("=== Testing WhatsApp Connection ===")
@@ -226,32 +870,125 @@ class WhatsAppService:
             'logged_in': self.is_logged_in,
             'last_activity': self.last_activity,
         }
+
+class BrowserPool:
+    """
+    Fixed set of WhatsAppService instances, one browser each, used in parallel
+    Duck-types the parts of WhatsAppService the scheduler uses
+    """
     
-    def __del__(self):
-        """Cleanup when object is destroyed"""
-        self.close_browser()
+    def __init__(self, size=None, log_callback=None):
+        """Create the services; browsers start lazily on first use"""
+        if size is None:
+            size = config.POOL_SIZE
+        
+        self.size = max(1, size)
+        # One WhatsApp number behind every slot, so one rate limit for all
+        rate = TokenBucket(config.SEND_RATE_PER_SECOND, config.SEND_BURST)
+        self.services = [WhatsAppService(log_callback, slot, rate) for slot in range(self.size)]
+        self._idle = queue.Queue()
+        for service in self.services:
+            self._idle.put(service)
+    
+    def acquire(self, timeout=None):
+        """Take an idle service, blocking until one is free"""
+        return self._idle.get(timeout=timeout)
+    
+    def release(self, service):
+        """Return a service to the pool"""
+        self._idle.put(service)
+    
+    def _send_group(self, group):
+        """Send one phone's messages on a single pooled browser"""
+        service = self.acquire()
+        try:
+            return service.send_batch([message for _, message in group])
+        finally:
+            self.release(service)
+    
+    def send_message_with_retry(self, phone, message, max_retries=None):
+        """Send one message on whichever browser is free"""
+        service = self.acquire()
+        try:
+            return service.send_message_with_retry(phone, message, max_retries)
+        finally:
+            self.release(service)
+    
+    def send_batch(self, messages):
+        """
+        Send messages across the pool, one phone's messages per worker
+        
+        Args:
+            messages: List of (phone, message) tuples
+            
+        Returns:
+            list: (success: bool, error_message: str or None) per message, in input order
+        """
+        if not messages:
+            return []
+        
+        groups = {}
+        for i, (phone, message) in enumerate(messages):
+            groups.setdefault(_clean_phone(phone), []).append((i, (phone, message)))
+        
+        results = [None] * len(messages)
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [(group, executor.submit(self._send_group, group)) for group in groups.values()]
+            for group, future in futures:
+                for (i, _), result in zip(group, future.result()):
+                    results[i] = result
+        
+        return results
+    
+    def check_health(self):
+        """Close idle browsers that timed out or whose driver no longer responds"""
+        for _ in range(self.size):
+            try:
+                service = self._idle.get_nowait()
+            except queue.Empty:
+                break  # The rest are busy sending, so healthy enough
+            
+            try:
+                service.check_browser_timeout()
+                if service.driver:
+                    try:
+                        service.driver.current_url
+                    except WebDriverException:
+                        service.log(f"Browser {service.slot} stopped responding - recycling")
+                        service.reset()
+            finally:
+                self._idle.put(service)
+    
+    def close_browser(self):
+        """Close every browser in the pool"""
+        for service in self.services:
+            service.close_browser()
+    
+    def get_status(self):
+        """Status of the first browser, plus how many are running"""
+        status = self.services[0].get_status()
+        status['pool_size'] = self.size
+        status['browsers_active'] = sum(service.driver is not None for service in self.services)
+        return status
 
 # =============================================================================
 # USAGE EXAMPLE
 # =============================================================================
 
 if __name__ == "__main__":
-    # Test WhatsApp service
-    service = WhatsAppService()
-    
-    # Login
-    if service.login_to_whatsapp():
-        # Send test message
-        phone = "+27821234567"  # Replace with your number
-        message = "This is a test message from WhatsApp Reminder Manager!"
-        
-        success, error = service.send_message(phone, message)
+    # Test WhatsApp service - the browser closes when the block exits
+    with WhatsAppService() as service:
+        # Login
+        if service.login_to_whatsapp():
+            # Send test message
+            phone = "+27821234567"  # Replace with your number
+            message = "This is a test message from WhatsApp Reminder Manager!"
+            
+            success, error = service.send_message(phone, message)
+            
+            if success:
+                print("Test message sent successfully!")
+            else:
+                print(f"Failed to send test message: {error}")
         
-        if success:
-            print("Test message sent successfully!")
-        else:
-            print(f"Failed to send test message: {error}")
-    
-    # Cleanup
-    input("Press Enter to close browser...")
-    service.close_browser()
\ No newline at end of file
+        input("Press Enter to close browser...")
\ No newline at end of file